@@ -5,15 +5,34 @@ Watches an AI solve all 3 maze levels automatically using BFS pathfinding.
 It collects every star before heading to the exit for maximum score!
 
 Run: python maze_auto.py [--speed fast|normal|slow]
+     python maze_auto.py --batch levels/*.txt [--workers N]   (headless, NDJSON)
+     python maze_auto.py --bench [--sizes 10,100,1000] [--csv out.csv]
 """
 
 import os
 import sys
+import json
 import time
+import csv
+import heapq
+import random
+import sqlite3
+import hashlib
 import argparse
+import itertools
+import tracemalloc
+from array import array
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import partial
 from copy import deepcopy
 
+try:
+    import numpy as np
+except ImportError:      # optional — Grid falls back to bytearray
+    np = None
+
 # ─────────────────────────────────────────────
 # ANSI COLORS
 # ─────────────────────────────────────────────
@@ -89,142 +108,1206 @@ LEVELS = [
     },
 ]
 
+# ─────────────────────────────────────────────
+# GRID  (1 byte per cell)
+# ─────────────────────────────────────────────
+WALL = ord('#')
+
+class Grid:
+    """
+    Maze cells stored flat, one byte each, at index r*cols+c.
+
+    `cells` is a uint8 NumPy array when NumPy is installed (so cell lookups
+    by symbol are vectorised) and a bytearray otherwise. `passable` is
+    always a bytearray mask — 1 where the cell is not a wall — because
+    single-element reads from a bytearray are much cheaper than from a
+    NumPy array in the BFS inner loops.
+    """
+
+    def __init__(self, rows_text):
+        self.rows = len(rows_text)
+        self.cols = max(len(r) for r in rows_text)
+        data = b"".join(r.encode("ascii").ljust(self.cols) for r in rows_text)
+        if np is not None:
+            self.cells = np.frombuffer(data, dtype=np.uint8).copy()
+            self.passable = bytearray((self.cells != WALL).astype(np.uint8).tobytes())
+        else:
+            self.cells = bytearray(data)
+            self.passable = bytearray(data.translate(_PASSABLE_TABLE))
+
+    def find(self, symbol):
+        """All (r, c) holding `symbol`, in row-major order."""
+        code = ord(symbol)
+        if np is not None:
+            flat = np.flatnonzero(self.cells == code).tolist()
+        else:
+            flat, i = [], self.cells.find(code)
+            while i != -1:
+                flat.append(i)
+                i = self.cells.find(code, i + 1)
+        return [divmod(i, self.cols) for i in flat]
+
+    def get(self, r, col):
+        return chr(self.cells[r * self.cols + col])
+
+    def set(self, r, col, symbol):
+        idx = r * self.cols + col
+        self.cells[idx] = ord(symbol)
+        self.passable[idx] = symbol != '#'
+
+    def row(self, r):
+        """Row `r` as a string."""
+        return bytes(self.cells[r * self.cols:(r + 1) * self.cols]).decode("ascii")
+
+_PASSABLE_TABLE = bytes(0 if b == WALL else 1 for b in range(256))
+
 # ─────────────────────────────────────────────
 # BFS PATHFINDER
 # ─────────────────────────────────────────────
-def bfs(grid, start, targets):
+def bfs(grid, start, targets, stats=None):
     """
     BFS from `start` to the nearest cell in `targets`.
     Returns list of (r, c) positions forming the path (inclusive of start & end),
-    or None if unreachable.
+    or None if unreachable. Popped nodes are added to stats["expanded"].
+
+    Cells are addressed by flat index r*cols+c. Instead of carrying a copy of
+    the path with every queued node, each cell stores the index of the cell it
+    was reached from in a compact array('i'); the path is rebuilt once, when
+    a target is popped.
     """
-    rows = len(grid)
-    cols = len(grid[0])
-    queue = deque()
-    queue.append((start, [start]))
-    visited = {start}
+    rows, cols = grid.rows, grid.cols
+    passable = grid.passable
+    start_idx = start[0] * cols + start[1]
+    target_idx = {r * cols + col for r, col in targets}
+
+    parent = array('i', [-1]) * (rows * cols)
+    parent[start_idx] = start_idx
+    queue = deque([start_idx])
+    expanded = 0
 
     while queue:
-        (r, c), path = queue.popleft()
-        if (r, c) in targets:
-            return path
-        for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-            nr, nc = r+dr, c+dc
-            if 0 <= nr < rows and 0 <= nc < cols and (nr, nc) not in visited:
-                cell = grid[nr][nc]
-                if cell != '#':
-                    visited.add((nr, nc))
-                    queue.append(((nr, nc), path + [(nr, nc)]))
+        idx = queue.popleft()
+        expanded += 1
+        if idx in target_idx:
+            _count(stats, expanded, "bfs")
+            return _rebuild_path(parent, idx, cols)
+        r, col = divmod(idx, cols)
+        # Same neighbour order as before: up, down, left, right
+        if r > 0 and parent[idx - cols] == -1 and passable[idx - cols]:
+            parent[idx - cols] = idx
+            queue.append(idx - cols)
+        if r < rows - 1 and parent[idx + cols] == -1 and passable[idx + cols]:
+            parent[idx + cols] = idx
+            queue.append(idx + cols)
+        if col > 0 and parent[idx - 1] == -1 and passable[idx - 1]:
+            parent[idx - 1] = idx
+            queue.append(idx - 1)
+        if col < cols - 1 and parent[idx + 1] == -1 and passable[idx + 1]:
+            parent[idx + 1] = idx
+            queue.append(idx + 1)
+    _count(stats, expanded, "bfs")
     return None  # unreachable
 
-def solve_level(level_data):
+def _count(stats, expanded, kind):
+    """
+    Add one search and its expanded-node count to an optional stats dict.
+    If the dict carries a "log" list (see Profiler), each call is also
+    appended to it as (kind, expanded, perf_counter_ns).
+    """
+    if stats is not None:
+        stats["searches"] = stats.get("searches", 0) + 1
+        stats["expanded"] = stats.get("expanded", 0) + expanded
+        if "log" in stats:
+            stats["log"].append((kind, expanded, time.perf_counter_ns()))
+
+def _rebuild_path(parent, idx, cols):
+    """Walk parent links back from `idx` to the root and return (r, c) cells."""
+    path = []
+    while True:
+        path.append(divmod(idx, cols))
+        prev = parent[idx]
+        if prev == idx:
+            break
+        idx = prev
+    path.reverse()
+    return path
+
+def bfs_flood(grid, start, targets=None, stats=None):
+    """
+    BFS flood from `start`, stopping early once every cell in `targets`
+    (flat indices) has been reached; floods everything when targets is None.
+    Returns (dist, parent) as flat array('i') indexed by r*cols+c;
+    unreached cells hold -1 in both.
+    """
+    rows, cols = grid.rows, grid.cols
+    passable = grid.passable
+    start_idx = start[0] * cols + start[1]
+
+    dist = array('i', [-1]) * (rows * cols)
+    parent = array('i', [-1]) * (rows * cols)
+    dist[start_idx] = 0
+    parent[start_idx] = start_idx
+    queue = deque([start_idx])
+    remaining = set(targets) if targets is not None else None
+    expanded = 0
+
+    while queue:
+        idx = queue.popleft()
+        expanded += 1
+        if remaining is not None:
+            remaining.discard(idx)
+            if not remaining:
+                break
+        d = dist[idx] + 1
+        r, col = divmod(idx, cols)
+        if r > 0 and dist[idx - cols] == -1 and passable[idx - cols]:
+            dist[idx - cols], parent[idx - cols] = d, idx
+            queue.append(idx - cols)
+        if r < rows - 1 and dist[idx + cols] == -1 and passable[idx + cols]:
+            dist[idx + cols], parent[idx + cols] = d, idx
+            queue.append(idx + cols)
+        if col > 0 and dist[idx - 1] == -1 and passable[idx - 1]:
+            dist[idx - 1], parent[idx - 1] = d, idx
+            queue.append(idx - 1)
+        if col < cols - 1 and dist[idx + 1] == -1 and passable[idx + 1]:
+            dist[idx + 1], parent[idx + 1] = d, idx
+            queue.append(idx + 1)
+    _count(stats, expanded, "flood")
+    return dist, parent
+
+# ─────────────────────────────────────────────
+# POINT-TO-POINT SEARCH STRATEGIES
+# ─────────────────────────────────────────────
+# Each takes (grid, start, goal, stats) and returns an optimal path as a
+# list of (r, c) or None, adding its popped-node count to stats["expanded"].
+
+def bfs_search(grid, start, goal, stats=None):
+    """Plain BFS — the baseline every other strategy must match."""
+    return bfs(grid, start, {goal}, stats)
+
+def astar(grid, start, goal, stats=None):
+    """A* with the Manhattan heuristic; ties go to the node nearer the goal."""
+    rows, cols = grid.rows, grid.cols
+    passable = grid.passable
+    gr, gc = goal
+    start_idx, goal_idx = start[0] * cols + start[1], gr * cols + gc
+
+    g = array('i', [-1]) * (rows * cols)
+    parent = array('i', [-1]) * (rows * cols)
+    closed = bytearray(rows * cols)
+    g[start_idx] = 0
+    parent[start_idx] = start_idx
+    h0 = abs(start[0] - gr) + abs(start[1] - gc)
+    heap = [(h0, h0, start_idx)]
+    expanded = 0
+
+    while heap:
+        _, _, idx = heapq.heappop(heap)
+        if closed[idx]:
+            continue
+        closed[idx] = 1
+        expanded += 1
+        if idx == goal_idx:
+            _count(stats, expanded, "astar")
+            return _rebuild_path(parent, idx, cols)
+        r, col = divmod(idx, cols)
+        ng = g[idx] + 1
+        for ok, nidx, nr, nc in (
+            (r > 0,          idx - cols, r - 1, col),
+            (r < rows - 1,   idx + cols, r + 1, col),
+            (col > 0,        idx - 1,    r,     col - 1),
+            (col < cols - 1, idx + 1,    r,     col + 1),
+        ):
+            if ok and passable[nidx] and not closed[nidx] and (g[nidx] == -1 or ng < g[nidx]):
+                g[nidx] = ng
+                parent[nidx] = idx
+                h = abs(nr - gr) + abs(nc - gc)
+                heapq.heappush(heap, (ng + h, h, nidx))
+    _count(stats, expanded, "astar")
+    return None
+
+def bidir_bfs(grid, start, goal, stats=None):
+    """
+    Bidirectional BFS: grows whichever frontier is smaller one full layer at a
+    time. When a layer touches the other side, every meeting point in that
+    layer is considered so the shortest connection wins.
+    """
+    rows, cols = grid.rows, grid.cols
+    passable = grid.passable
+    s_idx, t_idx = start[0] * cols + start[1], goal[0] * cols + goal[1]
+    if s_idx == t_idx:
+        _count(stats, 0, "bidir")
+        return [start]
+
+    dist = [array('i', [-1]) * (rows * cols), array('i', [-1]) * (rows * cols)]
+    parent = [array('i', [-1]) * (rows * cols), array('i', [-1]) * (rows * cols)]
+    frontier = [[s_idx], [t_idx]]
+    for side, idx in ((0, s_idx), (1, t_idx)):
+        dist[side][idx] = 0
+        parent[side][idx] = idx
+    expanded = 0
+
+    while frontier[0] and frontier[1]:
+        side = 0 if len(frontier[0]) <= len(frontier[1]) else 1
+        mine, other = dist[side], dist[1 - side]
+        par = parent[side]
+        best, meet = None, None
+        nxt = []
+        for idx in frontier[side]:
+            expanded += 1
+            r, col = divmod(idx, cols)
+            d = mine[idx] + 1
+            for ok, nidx in ((r > 0, idx - cols), (r < rows - 1, idx + cols),
+                             (col > 0, idx - 1), (col < cols - 1, idx + 1)):
+                if not ok or not passable[nidx]:
+                    continue
+                if mine[nidx] == -1:
+                    mine[nidx] = d
+                    par[nidx] = idx
+                    nxt.append(nidx)
+                if other[nidx] != -1:
+                    total = mine[nidx] + other[nidx]
+                    if best is None or total < best:
+                        best, meet = total, nidx
+        frontier[side] = nxt
+        if meet is not None:
+            _count(stats, expanded, "bidir")
+            head = _rebuild_path(parent[0], meet, cols)
+            tail = _rebuild_path(parent[1], meet, cols)
+            return head + tail[-2::-1]
+    _count(stats, expanded, "bidir")
+    return None
+
+def jps(grid, start, goal, stats=None):
+    """
+    Jump Point Search adapted to 4-connected moves.
+
+    Canonical shortest paths take vertical steps first and only turn
+    horizontal when they must. A horizontal jump runs until the goal, a
+    wall, or a cell whose upper/lower neighbour opens up behind a wall
+    (a forced turn). A vertical jump stops on any row from which a
+    horizontal jump finds something. Only jump points go on the A* heap,
+    so open rooms are crossed in a handful of expansions.
+
+    The jumps still touch cells, so the count added to stats["expanded"]
+    is heap pops plus every cell a jump scanned; that is the number to
+    compare with BFS. The pops alone go to stats["jump_points"].
+    """
+    rows, cols = grid.rows, grid.cols
+    passable = grid.passable
+    gr, gc = goal
+
+    def free(r, col):
+        return 0 <= r < rows and 0 <= col < cols and passable[r * cols + col]
+
+    scanned = [0]
+
+    def jump_h(r, col, dc):
+        while True:
+            col += dc
+            scanned[0] += 1
+            if not free(r, col):
+                return None
+            if (r, col) == goal:
+                return col
+            for dr in (-1, 1):
+                if free(r + dr, col) and not free(r + dr, col - dc):
+                    return col
+
+    def jump_v(r, col, dr):
+        while True:
+            r += dr
+            scanned[0] += 1
+            if not free(r, col):
+                return None
+            if (r, col) == goal:
+                return r
+            if jump_h(r, col, -1) is not None or jump_h(r, col, 1) is not None:
+                return r
+
+    def successors(r, col, dr, dc):
+        """Directions to search from a jump point reached moving (dr, dc)."""
+        if dr == dc == 0:                       # start: everything
+            return ((-1, 0), (1, 0), (0, -1), (0, 1))
+        if dc == 0:                             # vertical: keep going or turn either way
+            return ((dr, 0), (0, -1), (0, 1))
+        dirs = [(0, dc)]                        # horizontal: straight plus forced turns
+        for vr in (-1, 1):
+            if free(r + vr, col) and not free(r + vr, col - dc):
+                dirs.append((vr, 0))
+        return dirs
+
+    start_key = start
+    g = {start_key: 0}
+    came = {start_key: None}
+    h0 = abs(start[0] - gr) + abs(start[1] - gc)
+    heap = [(h0, h0, start, (0, 0))]
+    closed = set()
+    expanded = 0
+
+    while heap:
+        _, _, node, (dr, dc) = heapq.heappop(heap)
+        if node in closed:
+            continue
+        closed.add(node)
+        expanded += 1
+        if node == goal:
+            _count_jps(stats, expanded, scanned[0])
+            return _interpolate(_walk_back(came, node))
+        r, col = node
+        for vr, vc in successors(r, col, dr, dc):
+            if vc == 0:
+                hit = jump_v(r, col, vr)
+                nxt = None if hit is None else (hit, col)
+            else:
+                hit = jump_h(r, col, vc)
+                nxt = None if hit is None else (r, hit)
+            if nxt is None or nxt in closed:
+                continue
+            ng = g[node] + abs(nxt[0] - r) + abs(nxt[1] - col)
+            if nxt not in g or ng < g[nxt]:
+                g[nxt] = ng
+                came[nxt] = node
+                h = abs(nxt[0] - gr) + abs(nxt[1] - gc)
+                heapq.heappush(heap, (ng + h, h, nxt, (vr, vc)))
+    _count_jps(stats, expanded, scanned[0])
+    return None
+
+def _count_jps(stats, jump_points, scanned):
+    """Record a JPS search: cells touched as "expanded", pops as "jump_points"."""
+    _count(stats, jump_points + scanned, "jps")
+    if stats is not None:
+        stats["jump_points"] = stats.get("jump_points", 0) + jump_points
+
+def _walk_back(came, node):
+    chain = []
+    while node is not None:
+        chain.append(node)
+        node = came[node]
+    chain.reverse()
+    return chain
+
+def _interpolate(jump_points):
+    """Expand a chain of jump points (each in line with the next) into every cell."""
+    path = [jump_points[0]]
+    for (r0, c0), (r1, c1) in zip(jump_points, jump_points[1:]):
+        dr = (r1 > r0) - (r1 < r0)
+        dc = (c1 > c0) - (c1 < c0)
+        r, col = r0, c0
+        while (r, col) != (r1, c1):
+            r, col = r + dr, col + dc
+            path.append((r, col))
+    return path
+
+SEARCH_ALGOS = {
+    "bfs":   bfs_search,
+    "astar": astar,
+    "bidir": bidir_bfs,
+    "jps":   jps,
+}
+
+# ─────────────────────────────────────────────
+# ROUTE PLANNER  (distance matrix + star ordering)
+# ─────────────────────────────────────────────
+HELD_KARP_MAX_STARS = 15   # exact DP is O(2^k · k²): ~1s at 15 stars, doubling per star
+PLANNER_VERSION = 1        # bump when planning changes the route it returns; keys SolveCache
+INF = float("inf")
+
+def distance_matrix(grid, points, sources=None, stats=None):
+    """
+    One BFS flood from each of the first `sources` points (all by default),
+    each stopping once it has reached every other point.
+    Returns (dist, parents): dist[i][j] is the shortest walk from points[i]
+    to points[j] (INF if unreachable) and parents[i] is the flood's parent
+    array, kept so legs can be rebuilt without searching again. Rows of
+    points that were not flooded are filled in by symmetry; their parents
+    entry is None.
+    """
+    cols = grid.cols
+    flat = [r * cols + col for r, col in points]
+    sources = len(points) if sources is None else sources
+    dist, parents = [], []
+    for p in points[:sources]:
+        d, parent = bfs_flood(grid, p, flat, stats)
+        dist.append([d[i] if d[i] >= 0 else INF for i in flat])
+        parents.append(parent)
+    for i in range(sources, len(points)):
+        dist.append([dist[j][i] if j < sources else (0 if j == i else INF)
+                     for j in range(len(points))])
+        parents.append(None)
+    return dist, parents
+
+def _route_cost(dist, route):
+    return sum(dist[a][b] for a, b in zip(route, route[1:]))
+
+def held_karp(dist, start, stars, end):
+    """
+    Exact shortest start → (every star) → end ordering by bitmask DP.
+    `end` may be None, meaning the route may finish on any star.
+    """
+    k = len(stars)
+    if k == 0:
+        return []
+    full = (1 << k) - 1
+    # dp[mask][j] = cost of visiting `mask` starting at `start`, ending on stars[j]
+    dp = [[INF] * k for _ in range(1 << k)]
+    back = [[-1] * k for _ in range(1 << k)]
+    for j in range(k):
+        dp[1 << j][j] = dist[start][stars[j]]
+
+    for mask in range(1, 1 << k):
+        row = dp[mask]
+        for j in range(k):
+            cost = row[j]
+            if cost == INF or not (mask >> j) & 1:
+                continue
+            dj = dist[stars[j]]
+            for n in range(k):
+                if (mask >> n) & 1:
+                    continue
+                nmask = mask | (1 << n)
+                new = cost + dj[stars[n]]
+                if new < dp[nmask][n]:
+                    dp[nmask][n] = new
+                    back[nmask][n] = j
+
+    tail = [0 if end is None else dist[stars[j]][end] for j in range(k)]
+    last = min(range(k), key=lambda j: dp[full][j] + tail[j])
+
+    order, mask = [], full
+    while last != -1:
+        order.append(stars[last])
+        last, mask = back[mask][last], mask & ~(1 << last)
+    order.reverse()
+    return order
+
+def _nearest_neighbour(dist, start, stars):
+    order, current, left = [], start, set(stars)
+    while left:
+        current = min(left, key=lambda s: dist[current][s])
+        order.append(current)
+        left.remove(current)
+    return order
+
+def two_opt(dist, route):
+    """2-opt on an open route; route[0] and route[-1] stay fixed."""
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, len(route) - 2):
+            for j in range(i + 1, len(route) - 1):
+                a, b, x, y = route[i-1], route[i], route[j], route[j+1]
+                if dist[a][x] + dist[b][y] < dist[a][b] + dist[x][y]:
+                    route[i:j+1] = reversed(route[i:j+1])
+                    improved = True
+    return route
+
+def or_opt(dist, route):
+    """Or-opt: move segments of 1–3 stops elsewhere; endpoints stay fixed."""
+    improved = True
+    while improved:
+        improved = False
+        for seg_len in (1, 2, 3):
+            for i in range(1, len(route) - seg_len):
+                seg = route[i:i+seg_len]
+                rest = route[:i] + route[i+seg_len:]
+                base = _route_cost(dist, route)
+                for j in range(1, len(rest)):
+                    if j == i:
+                        continue
+                    cand = rest[:j] + seg + rest[j:]
+                    if _route_cost(dist, cand) < base:
+                        route[:] = cand
+                        improved = True
+                        break
+                if improved:
+                    break
+            if improved:
+                break
+    return route
+
+def heuristic_order(dist, start, stars, end):
+    """Nearest-neighbour seed refined with 2-opt and Or-opt until neither improves."""
+    order = _nearest_neighbour(dist, start, stars)
+    if end is None:
+        # Free end: a zero-cost sentinel lets the fixed-endpoint moves apply unchanged
+        sentinel = len(dist)
+        dist = [row + [0] for row in dist] + [[0] * (len(dist) + 1)]
+        end = sentinel
+    route = [start] + order + [end]
+    best = INF
+    while _route_cost(dist, route) < best:
+        best = _route_cost(dist, route)
+        two_opt(dist, route)
+        or_opt(dist, route)
+    return route[1:-1]
+
+def order_stars(dist, star_ids, end):
+    """Visiting order for `star_ids` from point 0: exact when small enough, else heuristic."""
+    if len(star_ids) <= HELD_KARP_MAX_STARS:
+        return held_karp(dist, 0, star_ids, end)
+    return heuristic_order(dist, 0, star_ids, end)
+
+def plan_route(grid, start, stars, exit_pos, algo="bfs", stats=None):
+    """
+    Order the stars and stitch the legs into one cell-by-cell path.
+    Returns (full_path, visited_stars).
+
+    With no stars the route is a single start → exit leg, found with the
+    point-to-point strategy `algo` (see SEARCH_ALGOS). Otherwise the start
+    and each star are flooded — the exit never needs its own flood, since
+    every other flood already reaches it.
+    """
+    if not stars:
+        if exit_pos is None:
+            return [start], []
+        leg = SEARCH_ALGOS[algo](grid, start, exit_pos, stats)
+        return (leg or [start]), []
+
+    points = [start] + list(stars) + ([exit_pos] if exit_pos else [])
+    dist, parents = distance_matrix(grid, points, sources=len(stars) + 1, stats=stats)
+    cols = grid.cols
+
+    # Stars not reachable from the start are skipped, as before
+    star_ids = [i for i in range(1, len(stars) + 1) if dist[0][i] < INF]
+    end = len(points) - 1 if exit_pos and dist[0][len(points) - 1] < INF else None
+
+    order = order_stars(dist, star_ids, end)
+
+    full_path = [start]
+    current = 0
+    for nxt in order + ([end] if end is not None else []):
+        target = points[nxt]
+        leg = _rebuild_path(parents[current], target[0] * cols + target[1], cols)
+        full_path.extend(leg[1:])
+        current = nxt
+    return full_path, [points[i] for i in order]
+
+def parse_level(level_data):
+    """Load the level's rows into a Grid and locate start, exit and stars."""
+    grid = Grid(level_data["grid"])
+    start = next(iter(grid.find('@')), None)
+    exit_pos = next(iter(grid.find('E')), None)
+    stars = grid.find('*')
+    return grid, start, exit_pos, stars
+
+def solve_level(level_data, algo="bfs", stats=None, cache=None):
     """
     Plan the full route:
-      1. Visit every star (greedy nearest-star order)
+      1. Visit every star (shortest overall order — see plan_route)
       2. Then go to exit E
     Returns a list of (r,c) waypoints covering the complete journey.
+    With a SolveCache, a previously planned layout is returned without planning.
     """
-    raw_grid = level_data["grid"]
-    # Build mutable grid
-    grid = [list(row) for row in raw_grid]
-    cols = max(len(r) for r in grid)
-    for row in grid:
-        while len(row) < cols:
-            row.append(' ')
-
-    # Locate key cells
-    start = None
-    exit_pos = None
-    stars = []
-    for r, row in enumerate(grid):
-        for col, cell in enumerate(row):
-            if cell == '@':
-                start = (r, col)
-            elif cell == 'E':
-                exit_pos = (r, col)
-            elif cell == '*':
-                stars.append((r, col))
-
-    full_path = [start]
-    current = start
-    remaining_stars = list(stars)
-
-    # Greedy: always go to nearest reachable star
-    while remaining_stars:
-        path = bfs(grid, current, set(remaining_stars))
-        if path is None:
-            break  # unreachable star — skip
-        # Append path (skip first node, already in full_path)
-        full_path.extend(path[1:])
-        current = path[-1]
-        remaining_stars.remove(current)
-
-    # Finally go to exit
-    path_to_exit = bfs(grid, current, {exit_pos})
-    if path_to_exit:
-        full_path.extend(path_to_exit[1:])
+    grid, start, exit_pos, stars = parse_level(level_data)
+    if cache is None:
+        full_path, _ = plan_route(grid, start, stars, exit_pos, algo, stats)
+        return full_path, grid, stars, exit_pos
 
+    key = cache.key(level_data, algo)
+    full_path = cache.get(key)
+    if stats is not None:
+        stats["cache"] = "miss" if full_path is None else "hit"
+    if full_path is None:
+        full_path, _ = plan_route(grid, start, stars, exit_pos, algo, stats)
+        cache.put(key, full_path, grid.cols)
     return full_path, grid, stars, exit_pos
 
+def level_score(stars_collected, moves, elapsed):
+    """50 per star plus a time/move bonus that bottoms out at zero."""
+    return stars_collected * 50 + max(0, 200 - moves * 2 - elapsed)
+
+# ─────────────────────────────────────────────
+# DYNAMIC MAZES  (D* Lite incremental replanning)
+# ─────────────────────────────────────────────
+class DStarLite:
+    """
+    D* Lite (Koenig & Likhachev) on the 4-connected grid, searching from
+    `goal` back to the agent. When cells open or close, only the vertices
+    whose distance actually changes are re-expanded, instead of searching
+    the whole leg again; the agent moving needs no search at all.
+    """
+
+    def __init__(self, grid, start, goal, stats=None):
+        self.grid = grid
+        self.cols = grid.cols
+        n = grid.rows * grid.cols
+        self.g = array('d', [INF]) * n
+        self.rhs = array('d', [INF]) * n
+        self.start = self.last = start[0] * self.cols + start[1]
+        self.goal = goal[0] * self.cols + goal[1]
+        self.km = 0
+        self.heap = []
+        self.open = {}          # idx -> current key; heap entries with another key are stale
+        self.stats = stats
+        self.rhs[self.goal] = 0
+        self._push(self.goal)
+        self.compute()
+
+    def _h(self, a, b):
+        ar, ac = divmod(a, self.cols)
+        br, bc = divmod(b, self.cols)
+        return abs(ar - br) + abs(ac - bc)
+
+    def _key(self, s):
+        m = min(self.g[s], self.rhs[s])
+        return (m + self._h(self.start, s) + self.km, m)
+
+    def _push(self, s):
+        k = self._key(s)
+        self.open[s] = k
+        heapq.heappush(self.heap, (k[0], k[1], s))
+
+    def _neighbours(self, idx):
+        r, col = divmod(idx, self.cols)
+        if r > 0:
+            yield idx - self.cols
+        if r < self.grid.rows - 1:
+            yield idx + self.cols
+        if col > 0:
+            yield idx - 1
+        if col < self.cols - 1:
+            yield idx + 1
+
+    def _update_vertex(self, u):
+        passable = self.grid.passable
+        if u != self.goal:
+            best = INF
+            if passable[u]:
+                for v in self._neighbours(u):
+                    if passable[v] and self.g[v] + 1 < best:
+                        best = self.g[v] + 1
+            self.rhs[u] = best
+        if self.g[u] != self.rhs[u]:
+            self._push(u)
+        else:
+            self.open.pop(u, None)
+
+    def compute(self):
+        expanded = 0
+        g, rhs, heap = self.g, self.rhs, self.heap
+        while heap:
+            k0, k1, u = heap[0]
+            if self.open.get(u) != (k0, k1):
+                heapq.heappop(heap)
+                continue
+            if (k0, k1) >= self._key(self.start) and rhs[self.start] == g[self.start]:
+                break
+            heapq.heappop(heap)
+            new_key = self._key(u)
+            if (k0, k1) < new_key:
+                self._push(u)
+                continue
+            del self.open[u]
+            expanded += 1
+            if g[u] > rhs[u]:
+                g[u] = rhs[u]
+            else:
+                g[u] = INF
+                self._update_vertex(u)
+            for p in self._neighbours(u):
+                self._update_vertex(p)
+        _count(self.stats, expanded, "dstar")
+        return expanded
+
+    def move_to(self, pos):
+        self.start = pos[0] * self.cols + pos[1]
+
+    def update_cells(self, cells):
+        """Call after grid.set() on `cells`; repairs distances around them."""
+        self.km += self._h(self.last, self.start)
+        self.last = self.start
+        for r, col in cells:
+            idx = r * self.cols + col
+            self._update_vertex(idx)
+            for n in self._neighbours(idx):
+                self._update_vertex(n)
+        return self.compute()
+
+    def cost(self):
+        return self.g[self.start]
+
+    def next_step(self, idx=None):
+        """Neighbour of the agent (or `idx`) on a shortest path to the goal, or None."""
+        idx = self.start if idx is None else idx
+        if self.g[idx] == INF or idx == self.goal:
+            return None
+        passable = self.grid.passable
+        best = min((n for n in self._neighbours(idx) if passable[n]),
+                   key=lambda n: self.g[n], default=None)
+        if best is None or self.g[best] == INF:
+            return None
+        return best
+
+    def path(self):
+        """Cells from the agent to the goal (excluding the agent's own cell)."""
+        cells, idx = [], self.start
+        for _ in range(len(self.g)):
+            idx = self.next_step(idx)
+            if idx is None:
+                break
+            cells.append(divmod(idx, self.cols))
+        return cells
+
+class DynamicRoute:
+    """
+    Walks a level whose cells change mid-run. Edits come from the level's
+    "events" list ({"at": step, "cell": [r, c], "to": "#" | " " | "*"}) and,
+    with `rate` > 0, from random edits — each step has that chance to close
+    a corridor cell, open an inner wall or drop a new star.
+
+    Wall edits are repaired in place by the current leg's D* Lite search.
+    A new star re-runs the star ordering from the agent's position; the
+    legs themselves are still followed with D* Lite.
+    """
+
+    def __init__(self, grid, start, order, exit_pos, level_data=None,
+                 rate=0.0, seed=None, stats=None):
+        self.grid = grid
+        self.pos = start
+        self.exit_pos = exit_pos
+        self.targets = list(order) + ([exit_pos] if exit_pos else [])
+        self.rate = rate
+        self.rng = random.Random(seed)
+        self.stats = stats
+        self.events = {}
+        for ev in (level_data or {}).get("events", []):
+            self.events.setdefault(ev["at"], []).append((*ev["cell"], ev["to"]))
+        self.planner = None
+        self._new_leg()
+
+    def _new_leg(self):
+        # Stars already picked up on an earlier leg are no longer targets
+        while self.targets and self.targets[0] != self.exit_pos and \
+                self.grid.get(*self.targets[0]) != '*':
+            self.targets.pop(0)
+        self.planner = DStarLite(self.grid, self.pos, self.targets[0], self.stats) \
+            if self.targets else None
+
+    def _random_edits(self):
+        if self.rate <= 0 or self.rng.random() >= self.rate:
+            return []
+        roll = self.rng.random()
+        want, to = ((' ', '#') if roll < 0.45 else ('#', ' ') if roll < 0.9 else (' ', '*'))
+        rows, cols = self.grid.rows, self.grid.cols
+        for _ in range(20):
+            r, col = self.rng.randrange(1, rows - 1), self.rng.randrange(1, cols - 1)
+            if self.grid.get(r, col) == want:
+                return [(r, col, to)]
+        return []
+
+    def apply(self, edits):
+        """Apply edits; returns (walls_changed, new_stars)."""
+        changed, spawned = [], []
+        protected = {self.pos, *self.targets}
+        for r, col, to in edits:
+            if not (0 <= r < self.grid.rows and 0 <= col < self.grid.cols) or (r, col) in protected:
+                continue
+            if self.grid.get(r, col) not in (' ', '#') or self.grid.get(r, col) == to:
+                continue
+            self.grid.set(r, col, to)
+            (spawned if to == '*' else changed).append((r, col))
+        if spawned:
+            self._reorder(spawned)
+        elif changed and self.planner:
+            self.planner.update_cells(changed)
+        return changed, spawned
+
+    def _reorder(self, spawned):
+        stars = [t for t in self.targets if t != self.exit_pos] + spawned
+        points = [self.pos] + stars + ([self.exit_pos] if self.exit_pos else [])
+        dist, _ = distance_matrix(self.grid, points, sources=len(stars) + 1, stats=self.stats)
+        star_ids = [i for i in range(1, len(stars) + 1) if dist[0][i] < INF]
+        end = len(points) - 1 if self.exit_pos and dist[0][-1] < INF else None
+        self.targets = [points[i] for i in order_stars(dist, star_ids, end)] + \
+                       ([self.exit_pos] if self.exit_pos else [])
+        self._new_leg()
+
+    def walk(self, max_steps=None, patience=50):
+        """
+        Yield (pos, planned, note, new_stars, last) once for the start and
+        then once per step, the same shape animate_level gets from a static
+        route. Gives up after `patience` steps stuck behind a sealed exit.
+        """
+        max_steps = max_steps or 4 * self.grid.rows * self.grid.cols
+        blocked = 0
+        yield self.pos, self.planner.path() if self.planner else [], None, [], not self.targets
+
+        for step in range(max_steps):
+            if self.targets and self.targets[0] != self.exit_pos and \
+                    self.grid.get(*self.targets[0]) != '*':
+                self._new_leg()          # current star was collected on the way
+            if not self.targets:
+                return
+
+            changed, spawned = self.apply(self.events.get(step, []) + self._random_edits())
+            note = None
+            if spawned:
+                note = "✨ New star appeared — route re-ordered"
+            elif changed:
+                note = "🧱 Maze changed — route repaired"
+
+            nxt = self.planner.next_step()
+            if nxt is None:
+                if self.targets[0] != self.exit_pos:
+                    self.targets.pop(0)          # walled-off star: skip it
+                    self._new_leg()
+                    continue
+                blocked += 1
+                if blocked > patience:
+                    yield self.pos, [], "🧱 Exit sealed off — giving up", spawned, True
+                    return
+                yield self.pos, [], "🧱 Exit blocked — waiting for the maze to open", spawned, False
+                continue
+            blocked = 0
+
+            self.pos = divmod(nxt, self.grid.cols)
+            self.planner.move_to(self.pos)
+            if self.pos == self.targets[0]:
+                self.targets.pop(0)
+                self._new_leg()
+            last = not self.targets
+            yield self.pos, self.planner.path() if self.planner else [], note, spawned, last
+            if last:
+                return
+
+# ─────────────────────────────────────────────
+# SOLVE CACHE  (SQLite, LRU)
+# ─────────────────────────────────────────────
+class SolveCache:
+    """
+    Planned routes on disk, keyed by a hash of the grid text, the solver
+    options and PLANNER_VERSION, so known layouts skip planning. Paths are stored as packed
+    flat cell indices. Entries beyond `max_entries` are evicted least
+    recently used first. `hits` / `misses` count lookups on this instance.
+    """
+
+    def __init__(self, path="maze_cache.sqlite", max_entries=10000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS solves (
+                key       TEXT PRIMARY KEY,
+                cols      INTEGER NOT NULL,
+                path      BLOB    NOT NULL,
+                last_used INTEGER NOT NULL
+            )""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS solves_lru ON solves(last_used)")
+        self._evict()
+
+    @staticmethod
+    def key(level_data, algo="bfs"):
+        h = hashlib.sha256()
+        h.update("\n".join(level_data["grid"]).encode("utf-8"))
+        h.update(f"|planner={PLANNER_VERSION}|algo={algo}|held_karp={HELD_KARP_MAX_STARS}".encode())
+        return h.hexdigest()
+
+    def get(self, key):
+        """Cached full_path for `key`, or None."""
+        row = self.conn.execute("SELECT cols, path FROM solves WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.conn.execute("UPDATE solves SET last_used = ? WHERE key = ?", (time.time_ns(), key))
+        self.conn.commit()
+        cols, blob = row
+        flat = array('i')
+        flat.frombytes(blob)
+        return [divmod(i, cols) for i in flat]
+
+    def put(self, key, full_path, cols):
+        flat = array('i', (r * cols + col for r, col in full_path))
+        self.conn.execute("INSERT OR REPLACE INTO solves VALUES (?, ?, ?, ?)",
+                          (key, cols, flat.tobytes(), time.time_ns()))
+        self._evict()
+
+    def _evict(self):
+        """Drop the least recently used entries beyond max_entries."""
+        self.conn.execute("""
+            DELETE FROM solves WHERE key IN (
+                SELECT key FROM solves ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )""", (self.max_entries,))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+_open_caches = {}
+
+def open_cache(path, max_entries=10000):
+    """One SolveCache per path per process (batch workers each open their own)."""
+    if path not in _open_caches:
+        _open_caches[path] = SolveCache(path, max_entries)
+    return _open_caches[path]
+
 # ─────────────────────────────────────────────
 # RENDERER
 # ─────────────────────────────────────────────
+GRID_INDENT = "  "
+
+# Pre-styled cells — built once instead of per cell per frame
+CELL_PLAYER  = c("@", GREEN, BOLD)
+CELL_WALL    = c("█", GRAY)
+CELL_EXIT    = c("E", RED, BOLD)
+CELL_STAR    = c("★", YELLOW, BOLD)
+CELL_TRAIL   = c("·", BLUE)       # breadcrumb trail
+CELL_PLANNED = c("░", MAGENTA)    # planned future path
+CELL_EMPTY   = " "
+
+class FrameRenderer:
+    """
+    Keeps the last frame on screen and redraws only what changed.
+
+    A frame is a list of lines; each line is either a plain string (rewritten
+    whole when it differs) or a list of single-width cell strings (diffed cell
+    by cell and patched with cursor-move escapes). Every frame goes out in
+    one sys.stdout.write. With `fps` set, frames arriving faster than the
+    target rate — or while the terminal is still behind — are dropped unless
+    forced.
+    """
+
+    def __init__(self, fps=30, out=None):
+        self.out = out or sys.stdout
+        self.interval = 1.0 / fps if fps else 0.0
+        self.prev = None
+        self.next_due = 0.0
+        self.frames = 0
+        self.dropped = 0
+
+    def draw(self, frame, force=False):
+        """Render `frame`; returns False if it was dropped."""
+        now = time.perf_counter()
+        if not force and self.prev is not None and now < self.next_due:
+            self.dropped += 1
+            return False
+
+        buf = []
+        if self.prev is None:
+            buf.append("\033[?25l\033[2J\033[H")   # hide cursor, clear once
+            prev = []
+        else:
+            prev = self.prev
+
+        indent = len(GRID_INDENT)
+        for i, line in enumerate(frame):
+            old = prev[i] if i < len(prev) else None
+            if line == old:
+                continue
+            if isinstance(line, list) and isinstance(old, list) and len(line) == len(old):
+                last = -2
+                for j, cell in enumerate(line):
+                    if cell != old[j]:
+                        if j != last + 1:
+                            buf.append(f"\033[{i+1};{indent+j+1}H")
+                        buf.append(cell)
+                        last = j
+            else:
+                text = GRID_INDENT + "".join(line) if isinstance(line, list) else line
+                buf.append(f"\033[{i+1};1H{text}\033[K")
+        for i in range(len(frame), len(prev)):
+            buf.append(f"\033[{i+1};1H\033[K")
+        buf.append(f"\033[{len(frame)+1};1H")
+
+        self.out.write("".join(buf))
+        self.out.flush()
+        self.prev = frame
+        self.frames += 1
+
+        self.next_due = now + self.interval
+        done = time.perf_counter()
+        if done > self.next_due:
+            # The write overran the budget: give the terminal a full interval to catch up
+            self.next_due = done + self.interval
+        return True
+
+    def close(self):
+        """Show the cursor again and forget the screen contents."""
+        self.out.write("\033[?25h")
+        self.out.flush()
+        self.prev = None
+
 def render(grid, player, trail, stars_left, stars_total,
            moves, score, level_num, level_name, message,
-           planned_path, start_time):
-    os.system('cls' if os.name == 'nt' else 'clear')
+           planned_path, start_time, renderer, force=False):
     elapsed = int(time.time() - start_time)
 
-    print(c("╔════════════════════════════════════════╗", CYAN))
-    print(c(f"║  🤖 MAZE AUTO-SOLVER  — Level {level_num}/3     ║", CYAN))
-    print(c(f"║  {level_name:<38}║", CYAN))
-    print(c("╚════════════════════════════════════════╝", CYAN))
-    print(
+    frame = [
+        c("╔════════════════════════════════════════╗", CYAN),
+        c(f"║  🤖 MAZE AUTO-SOLVER  — Level {level_num}/3     ║", CYAN),
+        c(f"║  {level_name:<38}║", CYAN),
+        c("╚════════════════════════════════════════╝", CYAN),
         f"  {c('Moves:', GRAY)} {c(moves, YELLOW)}   "
         f"{c('Stars:', GRAY)} {c(f'{stars_total-len(stars_left)}/{stars_total}', YELLOW)}   "
         f"{c('Time:', GRAY)} {c(f'{elapsed}s', YELLOW)}   "
-        f"{c('Score:', GRAY)} {c(score, GREEN)}"
-    )
-    print()
+        f"{c('Score:', GRAY)} {c(score, GREEN)}",
+        "",
+    ]
 
     # Build set of trail and planned path for rendering
     trail_set   = set(trail)
     planned_set = set(planned_path)
 
-    for r, row in enumerate(grid):
-        line = ""
-        for col, cell in enumerate(row):
+    for r in range(grid.rows):
+        cells = []
+        for col, cell in enumerate(grid.row(r)):
             pos = (r, col)
             if pos == player:
-                line += c("@", GREEN, BOLD)
+                cells.append(CELL_PLAYER)
             elif cell == '#':
-                line += c("█", GRAY)
+                cells.append(CELL_WALL)
             elif cell == 'E':
-                line += c("E", RED, BOLD)
+                cells.append(CELL_EXIT)
             elif cell == '*':
-                line += c("★", YELLOW, BOLD)
+                cells.append(CELL_STAR)
             elif pos in trail_set:
-                line += c("·", BLUE)       # breadcrumb trail
+                cells.append(CELL_TRAIL)
             elif pos in planned_set:
-                line += c("░", MAGENTA)    # planned future path
+                cells.append(CELL_PLANNED)
             else:
-                line += " "
-        print("  " + line)
+                cells.append(CELL_EMPTY)
+        frame.append(cells)
 
-    print()
-    print(c("  Trail: · (visited)   Planned: ░ (upcoming)", GRAY))
+    frame.append("")
+    frame.append(c("  Trail: · (visited)   Planned: ░ (upcoming)", GRAY))
     if message:
-        print(c(f"\n  {message}", MAGENTA, BOLD))
+        frame.append("")
+        frame.append(c(f"  {message}", MAGENTA, BOLD))
+
+    return renderer.draw(frame, force=force)
+
+# ─────────────────────────────────────────────
+# PROFILER
+# ─────────────────────────────────────────────
+class Profiler:
+    """
+    Per-level phase timings (plan / render / sleep) from perf_counter_ns,
+    nodes expanded per search call, and frames drawn or dropped. Everything
+    is also kept as Chrome trace events for chrome://tracing or Perfetto.
+    """
+
+    PHASES = ("plan", "render", "sleep")
+
+    def __init__(self):
+        self.t0 = time.perf_counter_ns()
+        self.events = []
+        self.levels = []
+        self.level = None
+
+    def _us(self, ns):
+        return (ns - self.t0) / 1000
+
+    @contextmanager
+    def phase(self, name, **args):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            event = {"name": name, "ph": "X", "pid": 1, "tid": 1,
+                     "ts": self._us(start), "dur": (end - start) / 1000}
+            if args:
+                event["args"] = args
+            self.events.append(event)
+            if self.level is not None:
+                self.level[name] = self.level.get(name, 0) + (end - start)
+
+    def begin_level(self, name):
+        """Start a level; returns the stats dict to hand to the searches."""
+        self.level = {"name": name, "start": time.perf_counter_ns()}
+        self.level_stats = {"log": []}
+        return self.level_stats
+
+    def end_level(self, renderer):
+        lvl = self.level
+        end = time.perf_counter_ns()
+        lvl["total"] = end - lvl["start"]
+        lvl["frames"], lvl["dropped"] = renderer.frames, renderer.dropped
+        lvl["searches"] = [(kind, n) for kind, n, _ in self.level_stats["log"]]
+        for kind, n, ts in self.level_stats["log"]:
+            self.events.append({"name": kind, "ph": "i", "s": "t", "pid": 1, "tid": 1,
+                                "ts": self._us(ts), "args": {"expanded": n}})
+        self.events.append({"name": lvl["name"], "ph": "X", "pid": 1, "tid": 0,
+                            "ts": self._us(lvl["start"]), "dur": lvl["total"] / 1000})
+        self.levels.append(lvl)
+        self.level = None
+
+    def summary(self):
+        head = f"  {'Level':<18}{'plan ms':>9}{'render ms':>11}{'sleep ms':>10}{'other ms':>10}" \
+               f"{'frames':>8}{'dropped':>9}{'searches':>10}{'expanded':>10}{'max/call':>10}"
+        print(c(head, CYAN, BOLD))
+        for lvl in self.levels:
+            ms = {p: lvl.get(p, 0) / 1e6 for p in self.PHASES}
+            other = lvl["total"] / 1e6 - sum(ms.values())
+            counts = [n for _, n in lvl["searches"]]
+            print(f"  {lvl['name'][:17]:<18}{ms['plan']:>9.2f}{ms['render']:>11.2f}"
+                  f"{ms['sleep']:>10.1f}{other:>10.2f}{lvl['frames']:>8}{lvl['dropped']:>9}"
+                  f"{len(counts):>10}{sum(counts):>10}{max(counts, default=0):>10}")
+        for lvl in self.levels:
+            if lvl["searches"]:
+                calls = ", ".join(f"{kind}:{n}" for kind, n in lvl["searches"][:12])
+                more = f" … +{len(lvl['searches']) - 12}" if len(lvl["searches"]) > 12 else ""
+                print(c(f"  {lvl['name'][:17]:<18}", GRAY) + calls + more)
+
+    def dump_trace(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+        print(c(f"  Trace written to {path} (open in chrome://tracing or ui.perfetto.dev)", GRAY))
+
+class _NoProfiler:
+    """Stand-in when --profile is off; every hook is a no-op."""
+
+    def phase(self, name, **args):
+        return nullcontext()
+
+    def begin_level(self, name):
+        return None
+
+    def end_level(self, renderer):
+        pass
 
 # ─────────────────────────────────────────────
 # ANIMATE ONE LEVEL
 # ─────────────────────────────────────────────
-def animate_level(level_index, delay, total_score):
+def _static_walk(full_path):
+    """A precomputed route in DynamicRoute.walk()'s (pos, planned, note, new_stars, last) shape."""
+    for i, pos in enumerate(full_path):
+        yield pos, full_path[i+1:], None, [], i == len(full_path) - 1
+
+def _timed_walk(walk, prof):
+    """Count the time spent advancing a dynamic walk (its replanning) as "plan"."""
+    while True:
+        with prof.phase("plan"):
+            step = next(walk, None)
+        if step is None:
+            return
+        yield step
+
+def animate_level(level_index, delay, total_score, fps=30, algo="bfs", cache=None,
+                  dynamic=0.0, seed=None, profiler=None):
     level_data = LEVELS[level_index]
     level_name = level_data["name"]
     level_num  = level_index + 1
+    prof       = profiler or _NoProfiler()
+    stats      = prof.begin_level(level_name)
+
+    with prof.phase("plan", algo=algo):
+        full_path, grid, all_stars, exit_pos = solve_level(level_data, algo, stats, cache)
 
-    full_path, grid, all_stars, exit_pos = solve_level(level_data)
+    if dynamic > 0 or level_data.get("events"):
+        # Star order as planned = order the static route first reaches them
+        order = []
+        for pos in full_path:
+            if pos in all_stars and pos not in order:
+                order.append(pos)
+        walk = _timed_walk(DynamicRoute(grid, full_path[0], order, exit_pos, level_data,
+                                        rate=dynamic, seed=seed, stats=stats).walk(), prof)
+    else:
+        walk = _static_walk(full_path)
 
     stars_left   = list(all_stars)
     stars_total  = len(all_stars)
@@ -232,25 +1315,33 @@ def animate_level(level_index, delay, total_score):
     moves        = 0
     start_time   = time.time()
     message      = f"🤖 AI planning route... collecting {stars_total} star(s) first!"
+    renderer     = FrameRenderer(fps)
 
     # Show initial state briefly
-    render(grid, full_path[0], trail, stars_left, stars_total,
-           moves, total_score, level_num, level_name, message,
-           full_path[1:], start_time)
-    time.sleep(delay * 4)
+    with prof.phase("render"):
+        render(grid, full_path[0], trail, stars_left, stars_total,
+               moves, total_score, level_num, level_name, message,
+               full_path[1:], start_time, renderer, force=True)
+    with prof.phase("sleep"):
+        time.sleep(delay * 4)
 
-    for i, pos in enumerate(full_path):
+    prev = None
+    for i, (pos, planned, note, new_stars, last) in enumerate(walk):
         r, c_pos = pos
-        cell = grid[r][c_pos]
+        cell = grid.get(r, c_pos)
+        stars_left.extend(new_stars)
+        stars_total += len(new_stars)
 
         # Collect star
         if cell == '*':
-            grid[r][c_pos] = ' '
+            grid.set(r, c_pos, ' ')
             stars_left.remove(pos)
             message = "⭐ Star collected!"
             total_score += 50
         elif pos == exit_pos:
             message = "🎉 Exit reached!"
+        elif note:
+            message = note
         elif i == 0:
             message = f"🤖 Starting level {level_num}..."
         elif not stars_left:
@@ -258,23 +1349,23 @@ def animate_level(level_index, delay, total_score):
         else:
             message = f"🤖 Navigating... {len(stars_left)} star(s) remaining"
 
-        if i > 0:
-            trail.append(full_path[i-1])
+        if i > 0 and pos != prev:
+            trail.append(prev)
             moves += 1
-
-        # Upcoming path (everything after current position)
-        planned = full_path[i+1:]
+        prev = pos
 
         # Calculate live score
         elapsed   = int(time.time() - start_time)
-        lv_score  = (stars_total - len(stars_left)) * 50 + max(0, 200 - moves * 2 - elapsed)
+        lv_score  = level_score(stars_total - len(stars_left), moves, elapsed)
         disp_score = total_score - (stars_total - len(stars_left)) * 50 + lv_score
 
-        render(grid, pos, trail, stars_left, stars_total,
-               moves, disp_score, level_num, level_name, message,
-               planned, start_time)
+        with prof.phase("render"):
+            render(grid, pos, trail, stars_left, stars_total,
+                   moves, disp_score, level_num, level_name, message,
+                   planned, start_time, renderer, force=last)
 
-        time.sleep(delay)
+        with prof.phase("sleep"):
+            time.sleep(delay)
 
     # Pause on completed level
     elapsed   = int(time.time() - start_time)
@@ -284,9 +1375,12 @@ def animate_level(level_index, delay, total_score):
 
     # Actually compute cleanly:
     base       = total_score  # score before this level
-    lv_earned  = stars_total * 50 + max(0, 200 - moves * 2 - elapsed)
+    lv_earned  = level_score(stars_total, moves, elapsed)
 
-    time.sleep(delay * 5)
+    with prof.phase("sleep"):
+        time.sleep(delay * 5)
+    renderer.close()
+    prof.end_level(renderer)
     return base + lv_earned, moves, elapsed
 
 # ─────────────────────────────────────────────
@@ -300,8 +1394,8 @@ def show_title(speed_label):
   ║     🤖  MAZE ESCAPE — AUTO SOLVER  🤖    ║
   ║                                          ║
   ║  Watch AI solve all 3 mazes using BFS    ║
-  ║  pathfinding. Stars are collected        ║
-  ║  greedily (nearest-first) before exit.   ║
+  ║  pathfinding. Stars are collected in     ║
+  ║  the shortest overall order before exit. ║
   ║                                          ║
   ║  Trail  ·  = cells already visited       ║
   ║  Ahead  ░  = planned future path         ║
@@ -314,7 +1408,7 @@ def show_title(speed_label):
 """, CYAN))
     input("  > ")
 
-def show_summary(level_stats, grand_total):
+def show_summary(level_stats, grand_total, profiler=None, trace_path=None):
     os.system('cls' if os.name == 'nt' else 'clear')
     print(c("""
   ╔══════════════════════════════════════════╗
@@ -336,14 +1430,427 @@ def show_summary(level_stats, grand_total):
     print(c("  How the AI works:", CYAN, BOLD))
     print(c("  ─────────────────────────────────", GRAY))
     print("  1. " + c("BFS", YELLOW) + " maps the shortest path between any two points")
-    print("  2. Stars are collected in " + c("nearest-first (greedy)", YELLOW) + " order")
+    print("  2. Stars are collected in the " + c("shortest overall (Held-Karp)", YELLOW) + " order")
     print("  3. After all stars, BFS finds the " + c("shortest path to exit", YELLOW))
     print("  4. The " + c("· trail", BLUE) + " shows cells already visited")
     print("  5. The " + c("░ overlay", MAGENTA) + " shows the planned upcoming route")
     print()
+
+    if profiler:
+        print(c("  Profile:", CYAN, BOLD))
+        profiler.summary()
+        if trace_path:
+            profiler.dump_trace(trace_path)
+        print()
     print(c("  Press ENTER to exit.", GRAY))
     input()
 
+# ─────────────────────────────────────────────
+# MAZE GENERATOR  (seeded)
+# ─────────────────────────────────────────────
+_STEPS2 = [(-2,0),(2,0),(0,-2),(0,2)]
+
+def _blank(n, fill):
+    return [bytearray(fill * n) for _ in range(n)]
+
+def _backtracker(n, rng):
+    """Recursive backtracker (iterative): long corridors, a single route between any two cells."""
+    g = _blank(n, b'#')
+    stack = [(1, 1)]
+    g[1][1] = ord(' ')
+    while stack:
+        r, col = stack[-1]
+        nbrs = [(r+dr, col+dc) for dr, dc in _STEPS2
+                if 0 < r+dr < n-1 and 0 < col+dc < n-1 and g[r+dr][col+dc] == ord('#')]
+        if not nbrs:
+            stack.pop()
+            continue
+        nr, nc = rng.choice(nbrs)
+        g[(r+nr)//2][(col+nc)//2] = g[nr][nc] = ord(' ')
+        stack.append((nr, nc))
+    return g
+
+def _prim(n, rng):
+    """Randomised Prim's: many short dead ends branching off a central tree."""
+    g = _blank(n, b'#')
+    g[1][1] = ord(' ')
+    frontier = [(1, 1, 1+dr, 1+dc) for dr, dc in _STEPS2 if 0 < 1+dr < n-1 and 0 < 1+dc < n-1]
+    while frontier:
+        i = rng.randrange(len(frontier))
+        frontier[i], frontier[-1] = frontier[-1], frontier[i]
+        r, col, nr, nc = frontier.pop()
+        if g[nr][nc] != ord('#'):
+            continue
+        g[(r+nr)//2][(col+nc)//2] = g[nr][nc] = ord(' ')
+        for dr, dc in _STEPS2:
+            fr, fc = nr+dr, nc+dc
+            if 0 < fr < n-1 and 0 < fc < n-1 and g[fr][fc] == ord('#'):
+                frontier.append((nr, nc, fr, fc))
+    return g
+
+def _braid(n, rng, loops=0.5):
+    """Backtracker maze with a share of dead ends knocked through, creating loops."""
+    g = _backtracker(n, rng)
+    for r in range(1, n-1, 2):
+        for col in range(1, n-1, 2):
+            walls = [(r+dr//2, col+dc//2) for dr, dc in _STEPS2
+                     if 0 < r+dr < n-1 and 0 < col+dc < n-1]
+            if sum(g[wr][wc] == ord(' ') for wr, wc in walls) == 1 and rng.random() < loops:
+                closed = [w for w in walls if g[w[0]][w[1]] == ord('#')]
+                if closed:
+                    wr, wc = rng.choice(closed)
+                    g[wr][wc] = ord(' ')
+    return g
+
+def _rooms(n, rng, room=8):
+    """Open rooms on a lattice; every pair of neighbouring rooms shares one doorway."""
+    g = _blank(n, b' ')
+    for i in range(n):
+        g[0][i] = g[n-1][i] = g[i][0] = g[i][n-1] = ord('#')
+    lines = list(range(room, n-1, room))
+    for w in lines:
+        for i in range(n):
+            g[w][i] = g[i][w] = ord('#')
+    edges = [0] + lines + [n-1]
+    for a, b in zip(edges, edges[1:]):
+        for w in lines:
+            # Door through vertical wall `w` and horizontal wall `w` within span (a, b)
+            if b - a > 1:
+                d = rng.randrange(a+1, b)
+                g[d][w] = ord(' ')
+                d = rng.randrange(a+1, b)
+                g[w][d] = ord(' ')
+    return g
+
+GENERATORS = {
+    "backtracker": _backtracker,
+    "prim":        _prim,
+    "braid":       _braid,
+    "rooms":       _rooms,
+}
+
+def generate_maze(kind="backtracker", size=21, stars=3, seed=None):
+    """
+    Build a size×size level dict in the same shape as LEVELS.
+    Start is the top-left cell, exit the bottom-right one and `stars` stars
+    go on random open cells. The same seed always yields the same maze.
+    """
+    rng = random.Random(seed)
+    n = max(5, size | 1)            # odd side keeps cell/wall parity for the carvers
+    g = GENERATORS[kind](n, rng)
+
+    start, exit_pos = (1, 1), (n-2, n-2)
+    g[start[0]][start[1]] = ord('@')
+    g[exit_pos[0]][exit_pos[1]] = ord('E')
+
+    open_cells = [(r, col) for r in range(1, n-1) for col in range(1, n-1) if g[r][col] == ord(' ')]
+    for r, col in rng.sample(open_cells, min(stars, len(open_cells))):
+        g[r][col] = ord('*')
+
+    return {
+        "name": f"{kind} {n}x{n} seed={seed}",
+        "grid": [row.decode() for row in g],
+    }
+
+# ─────────────────────────────────────────────
+# BATCH SOLVER  (headless, NDJSON out)
+# ─────────────────────────────────────────────
+def load_level_file(path):
+    """
+    Read levels from a file.
+      *.json  — one level dict or a list of them ({"name": ..., "grid": [...]})
+      other   — plain-text grids, several mazes separated by blank lines
+    """
+    base = os.path.basename(path)
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+
+    if path.lower().endswith(".json"):
+        data = json.loads(text)
+        levels = data if isinstance(data, list) else [data]
+    else:
+        blocks = [b for b in text.split("\n\n") if b.strip()]
+        levels = [{"grid": b.strip("\n").splitlines()} for b in blocks]
+
+    for i, lvl in enumerate(levels):
+        lvl.setdefault("name", base if len(levels) == 1 else f"{base}#{i+1}")
+    return levels
+
+def solve_record(level_data, algo="bfs", cache_path=None, cache_size=10000):
+    """Solve one level and describe the result as a flat dict (one NDJSON line)."""
+    name = level_data.get("name", "")
+    stats = {}
+    try:
+        cache = open_cache(cache_path, cache_size) if cache_path else None
+        t0 = time.perf_counter_ns()
+        full_path, grid, stars, exit_pos = solve_level(level_data, algo, stats, cache)
+        solve_us = (time.perf_counter_ns() - t0) // 1000
+    except Exception as e:
+        return {"level": name, "error": f"{type(e).__name__}: {e}"}
+
+    moves = len(full_path) - 1
+    on_path = set(full_path)
+    collected = sum(1 for s in stars if s in on_path)
+    return {
+        "level": name,
+        "rows": grid.rows,
+        "cols": grid.cols,
+        "path_length": moves,
+        "stars": collected,
+        "stars_total": len(stars),
+        "reached_exit": bool(exit_pos) and full_path[-1] == exit_pos,
+        "score": level_score(collected, moves, 0),
+        "solve_us": solve_us,
+        "algo": algo,
+        "expanded": stats.get("expanded", 0),
+        "cache": stats.get("cache", "off"),
+    }
+
+def run_batch(paths, workers=1, out=sys.stdout, algo="bfs", cache_path=None, cache_size=10000):
+    """
+    Solve every level in `paths` (or the built-in LEVELS when empty) with no
+    rendering or sleeps, writing one JSON record per line as results arrive.
+    Records come out in input order even with several workers. Cache hit and
+    miss totals go to stderr when a cache is in use.
+    """
+    levels = []
+    for path in paths:
+        levels.extend(load_level_file(path))
+    if not paths:
+        levels = [dict(lvl) for lvl in LEVELS]
+
+    solve = partial(solve_record, algo=algo, cache_path=cache_path, cache_size=cache_size)
+    tally = {"hit": 0, "miss": 0}
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(solve, levels, chunksize=max(1, len(levels) // (workers * 4)))
+    else:
+        pool = None
+        results = map(solve, levels)
+
+    try:
+        for rec in results:
+            if rec.get("cache") in tally:
+                tally[rec["cache"]] += 1
+            out.write(json.dumps(rec) + "\n")
+            out.flush()
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if cache_path:
+        print(f"cache: {tally['hit']} hit(s), {tally['miss']} miss(es) — {cache_path}", file=sys.stderr)
+
+# ─────────────────────────────────────────────
+# BENCHMARK
+# ─────────────────────────────────────────────
+def _bfs_path_copy(grid, start, targets):
+    """Previous BFS that queued a full path copy with every node (reference only)."""
+    rows, cols = grid.rows, grid.cols
+    queue = deque([(start, [start])])
+    visited = {start}
+    while queue:
+        (r, col), path = queue.popleft()
+        if (r, col) in targets:
+            return path
+        for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
+            nr, nc = r+dr, col+dc
+            if 0 <= nr < rows and 0 <= nc < cols and (nr, nc) not in visited:
+                if grid.passable[nr * cols + nc]:
+                    visited.add((nr, nc))
+                    queue.append(((nr, nc), path + [(nr, nc)]))
+    return None
+
+def _open_grid(n):
+    """n×n open room with a wall border: worst case for frontier size."""
+    inner = "#" + " " * (n - 2) + "#"
+    return Grid(["#" * n] + [inner] * (n - 2) + ["#" * n])
+
+def benchmark_bfs(sizes=(100, 250, 500, 1000), copy_limit=500):
+    """
+    Time corner-to-corner BFS on open n×n grids.
+    The old path-copying BFS is only run up to `copy_limit` — beyond that
+    it takes minutes and gigabytes.
+    """
+    print(c(f"  {'size':>11}  {'cells':>9}  {'parent-array':>13}  {'path-copy':>11}  {'path':>6}", CYAN, BOLD))
+    for n in sizes:
+        grid = _open_grid(n)
+        start, goal = (1, 1), (n-2, n-2)
+
+        t0 = time.perf_counter()
+        path = bfs(grid, start, {goal})
+        t_new = time.perf_counter() - t0
+
+        if n <= copy_limit:
+            t0 = time.perf_counter()
+            _bfs_path_copy(grid, start, {goal})
+            old = f"{time.perf_counter() - t0:10.3f}s"
+        else:
+            old = f"{'skipped':>11}"
+
+        print(f"  {f'{n}x{n}':>11}  {n*n:>9}  {t_new:12.3f}s  {old}  {len(path):>6}")
+
+def benchmark_algos(sizes=(101, 501, 1001), kinds=("rooms", "braid"), seed=0):
+    """
+    Start → exit search on star-free generated mazes with every strategy.
+    Checks each path length against BFS and reports nodes expanded and time.
+    For JPS "expanded" includes the cells its jumps scanned; the jump points
+    actually pushed through the heap are shown separately.
+    """
+    print(c(f"  {'maze':>18}  {'algo':>6}  {'path':>6}  {'expanded':>9}  {'vs bfs':>7}  "
+            f"{'jump pts':>9}  {'ms':>9}", CYAN, BOLD))
+    for size in sizes:
+        for kind in kinds:
+            grid, start, exit_pos, _ = parse_level(generate_maze(kind, size, 0, seed))
+            base = None
+            for name, search in SEARCH_ALGOS.items():
+                stats = {}
+                t0 = time.perf_counter()
+                path = search(grid, start, exit_pos, stats)
+                ms = (time.perf_counter() - t0) * 1000
+                if base is None:
+                    base = (len(path), stats["expanded"])
+                elif len(path) != base[0]:
+                    print(c(f"  !! {name} path {len(path)} != bfs {base[0]}", RED, BOLD))
+                ratio = stats["expanded"] / base[1]
+                jumps = stats.get("jump_points", "")
+                print(f"  {f'{kind} {grid.rows}x{grid.cols}':>18}  {name:>6}  {len(path):>6}  "
+                      f"{stats['expanded']:>9}  {ratio:>6.1%}  {jumps:>9}  {ms:>9.1f}")
+
+def benchmark_replan(size=301, kind="braid", edits=60, seed=0):
+    """
+    Walk start → exit on a generated maze while toggling cells just ahead
+    of the agent. After every edit, time the D* Lite repair against a full
+    BFS and A* replan from the agent's cell, and check all three agree.
+    Edits that seal the exit off are checked, then undone untimed.
+    """
+    rng = random.Random(seed)
+    grid, start, exit_pos, _ = parse_level(generate_maze(kind, size, 0, seed))
+    dstar = DStarLite(grid, start, exit_pos)
+    pos = start
+    totals = {"dstar": [0.0, 0], "bfs": [0.0, 0], "astar": [0.0, 0]}
+    done = 0
+
+    while done < edits and pos != exit_pos:
+        ahead = dstar.path()[:25]
+        for _ in range(3):                                  # walk a few steps
+            nxt = dstar.next_step()
+            if nxt is not None:
+                pos = divmod(nxt, grid.cols)
+                dstar.move_to(pos)
+        if pos == exit_pos or not ahead:
+            break
+
+        # Local edit: block a cell on the route ahead, or open a wall next to it
+        r, col = rng.choice(ahead)
+        if rng.random() < 0.5 and (r, col) not in (pos, exit_pos):
+            cell = (r, col)
+        else:
+            walls = [(r+dr, col+dc) for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]
+                     if 0 < r+dr < grid.rows-1 and 0 < col+dc < grid.cols-1
+                     and grid.get(r+dr, col+dc) == '#']
+            if not walls:
+                continue
+            cell = rng.choice(walls)
+        grid.set(*cell, '#' if grid.get(*cell) == ' ' else ' ')
+
+        stats = {}
+        dstar.stats = stats
+        t0 = time.perf_counter()
+        dstar.update_cells([cell])
+        totals["dstar"][0] += time.perf_counter() - t0
+        totals["dstar"][1] += stats.get("expanded", 0)
+        cost = dstar.cost()
+
+        for name in ("bfs", "astar"):
+            stats = {}
+            t0 = time.perf_counter()
+            path = SEARCH_ALGOS[name](grid, pos, exit_pos, stats)
+            totals[name][0] += time.perf_counter() - t0
+            totals[name][1] += stats["expanded"]
+            expect = INF if path is None else len(path) - 1
+            if expect != cost:
+                print(c(f"  !! D* Lite cost {cost} != {name} {expect}", RED, BOLD))
+        done += 1
+        if cost == INF:
+            # Sealed the exit off: undo the edit (untimed) and keep walking
+            grid.set(*cell, ' ')
+            dstar.stats = None
+            dstar.update_cells([cell])
+
+    print(c(f"  {kind} {grid.rows}x{grid.cols}, {done} edit(s)", CYAN, BOLD))
+    print(c(f"  {'method':>10}  {'total ms':>10}  {'ms/edit':>9}  {'expanded/edit':>14}", CYAN))
+    for name, (secs, expanded) in totals.items():
+        per = max(done, 1)
+        label = "D* repair" if name == "dstar" else f"{name} replan"
+        print(f"  {label:>10}  {secs*1000:>10.1f}  {secs*1000/per:>9.2f}  {expanded/per:>14.0f}")
+
+def _reference_length(level_data):
+    """
+    Route length to judge solve_level against. Up to 7 stars it is the exact
+    optimum, worked out apart from the planner: one plain bfs() per pair of
+    points, then every star order. Above that it is nearest-first greedy
+    over the planner's own distance matrix, so optimality can exceed 1.0.
+    """
+    grid, start, exit_pos, stars = parse_level(level_data)
+    points = [start] + stars + [exit_pos]
+    end = len(points) - 1
+    if len(stars) <= 7:
+        dist = [[0] * len(points) for _ in points]
+        for a, b in itertools.combinations(range(len(points)), 2):
+            leg = bfs(grid, points[a], {points[b]})
+            dist[a][b] = dist[b][a] = INF if leg is None else len(leg) - 1
+        ids = [i for i in range(1, end) if dist[0][i] < INF]
+        best = min(_route_cost(dist, [0, *p, end]) for p in itertools.permutations(ids))
+        return best, "exact"
+    dist, _ = distance_matrix(grid, points)
+    ids = [i for i in range(1, end) if dist[0][i] < INF]
+    return _route_cost(dist, [0, *_nearest_neighbour(dist, 0, ids), end]), "greedy"
+
+BENCH_FIELDS = ["kind", "size", "cells", "stars", "seed", "solve_ms", "peak_mem_kb",
+                "path_length", "reference", "reference_length", "optimality"]
+
+def benchmark_solver(sizes=(10, 100, 500, 1000, 2000, 4000), kinds=tuple(GENERATORS),
+                     stars=5, seed=0, csv_path="maze_bench.csv"):
+    """
+    Time solve_level on generated mazes of every kind and size and write one
+    CSV row per maze. Wall time comes from a plain run; peak memory from a
+    second run under tracemalloc, which would otherwise skew the timing.
+    optimality = reference_length / path_length: 1.0 is optimal against an
+    "exact" reference; a "greedy" one (over 7 stars) can put it above 1.0.
+    """
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=BENCH_FIELDS)
+        writer.writeheader()
+        print(c("  " + "  ".join(f"{h:>11}" for h in BENCH_FIELDS[:2] + BENCH_FIELDS[5:8] + BENCH_FIELDS[-1:]), CYAN, BOLD))
+
+        for size in sizes:
+            for kind in kinds:
+                level = generate_maze(kind, size, stars, seed)
+                n = len(level["grid"])
+
+                t0 = time.perf_counter()
+                full_path, *_ = solve_level(level)
+                solve_ms = (time.perf_counter() - t0) * 1000
+
+                tracemalloc.start()
+                solve_level(level)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                ref_len, ref_kind = _reference_length(level)
+                moves = len(full_path) - 1
+                row = {
+                    "kind": kind, "size": n, "cells": n * n, "stars": stars, "seed": seed,
+                    "solve_ms": f"{solve_ms:.2f}", "peak_mem_kb": peak // 1024,
+                    "path_length": moves, "reference": ref_kind, "reference_length": ref_len,
+                    "optimality": f"{ref_len / moves:.4f}" if moves else "1.0000",
+                }
+                writer.writerow(row)
+                f.flush()
+                print("  " + "  ".join(f"{row[h]!s:>11}" for h in BENCH_FIELDS[:2] + BENCH_FIELDS[5:8] + BENCH_FIELDS[-1:]))
+    print(c(f"\n  CSV written to {csv_path}", GRAY))
+
 # ─────────────────────────────────────────────
 # MAIN
 # ─────────────────────────────────────────────
@@ -355,19 +1862,135 @@ def main():
         default="normal",
         help="Animation speed (default: normal)"
     )
+    parser.add_argument(
+        "--algo",
+        choices=list(SEARCH_ALGOS),
+        default="bfs",
+        help="Point-to-point search used for star-free legs (default: bfs)"
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="FILE",
+        default=None,
+        help="SQLite file of planned routes reused across runs, e.g. maze_cache.sqlite (default: off)"
+    )
+    parser.add_argument("--cache-size", type=int, default=10000,
+                        help="Most routes kept in the cache before LRU eviction (default: 10000)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore --cache and always plan from scratch")
+    parser.add_argument(
+        "--dynamic",
+        type=float,
+        default=0.0,
+        metavar="RATE",
+        help="Chance per step that a wall opens/closes or a star appears (default: 0 = static)"
+    )
+    parser.add_argument("--profile", action="store_true",
+                        help="Time planning/rendering/sleeping per level and print a table at the end")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="With --profile, also write a Chrome trace-event JSON to FILE")
+    parser.add_argument(
+        "--fps",
+        type=int,
+        default=30,
+        help="Target frame rate; frames beyond it are dropped (0 = no cap, default: 30)"
+    )
+    parser.add_argument(
+        "--bench-bfs",
+        action="store_true",
+        help="Benchmark BFS on open grids up to 1000x1000 and exit"
+    )
+    parser.add_argument(
+        "--batch",
+        nargs="*",
+        metavar="LEVEL_FILE",
+        help="Solve level files headlessly and print NDJSON (built-in levels if none given)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used by --batch (default: 1)"
+    )
+    parser.add_argument(
+        "--bench-algo",
+        action="store_true",
+        help="Compare --algo strategies on large star-free mazes and exit"
+    )
+    parser.add_argument(
+        "--bench-replan",
+        action="store_true",
+        help="Compare D* Lite repairs with full replans after local edits and exit"
+    )
+    parser.add_argument(
+        "--bench",
+        action="store_true",
+        help="Benchmark solve_level on generated mazes and write a CSV"
+    )
+    parser.add_argument(
+        "--sizes",
+        default="10,100,500,1000,2000,4000",
+        help="Comma-separated maze sides for --bench (default: 10,...,4000)"
+    )
+    parser.add_argument(
+        "--kinds",
+        default=",".join(GENERATORS),
+        help=f"Comma-separated generators for --bench ({', '.join(GENERATORS)})"
+    )
+    parser.add_argument("--stars", type=int, default=5, help="Stars per generated maze (default: 5)")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed (default: 0)")
+    parser.add_argument("--csv", default="maze_bench.csv", help="Output CSV for --bench")
+    parser.add_argument(
+        "--generate",
+        choices=list(GENERATORS),
+        help="Print one generated maze (uses --sizes' first value, --stars, --seed) and exit"
+    )
     args = parser.parse_args()
 
+    if args.generate:
+        size = int(args.sizes.split(",")[0])
+        print("\n".join(generate_maze(args.generate, size, args.stars, args.seed)["grid"]))
+        return
+
+    if args.bench_replan:
+        benchmark_replan(seed=args.seed)
+        return
+
+    if args.bench_algo:
+        benchmark_algos()
+        return
+
+    if args.bench:
+        benchmark_solver(sizes=[int(x) for x in args.sizes.split(",")],
+                         kinds=args.kinds.split(","), stars=args.stars,
+                         seed=args.seed, csv_path=args.csv)
+        return
+
+    cache_path = None if args.no_cache else args.cache
+
+    if args.batch is not None:
+        run_batch(args.batch, workers=args.workers, algo=args.algo,
+                  cache_path=cache_path, cache_size=args.cache_size)
+        return
+
+    if args.bench_bfs:
+        benchmark_bfs()
+        return
+
     delays = {"fast": 0.05, "normal": 0.18, "slow": 0.40}
     delay  = delays[args.speed]
     speed_labels = {"fast": "Fast  ⚡", "normal": "Normal 🚶", "slow": "Slow  🐢"}
 
     show_title(speed_labels[args.speed])
 
+    cache        = open_cache(cache_path, args.cache_size) if cache_path else None
+    profiler     = Profiler() if args.profile or args.trace else None
     grand_total  = 0
     level_stats  = []
 
     for i in range(len(LEVELS)):
-        new_total, moves, elapsed = animate_level(i, delay, grand_total)
+        new_total, moves, elapsed = animate_level(i, delay, grand_total, fps=args.fps, algo=args.algo,
+                                                  cache=cache, dynamic=args.dynamic,
+                                                  seed=args.seed, profiler=profiler)
         earned = new_total - grand_total
         level_stats.append((earned, moves, elapsed))
         grand_total = new_total
@@ -378,7 +2001,7 @@ def main():
             print(c(f"  Loading level {i+2}...\n", GRAY))
             time.sleep(1.5)
 
-    show_summary(level_stats, grand_total)
+    show_summary(level_stats, grand_total, profiler, args.trace)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
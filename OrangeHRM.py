@@ -14,6 +14,10 @@ pip install selenium webdriver-manager openpyxl pandas
 
 import time
 import os
+import sys
+import json
+import shutil
+import subprocess
 from datetime import datetime, timedelta
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -21,7 +25,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import Select
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 import logging
@@ -37,6 +41,99 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Resolved chromedriver paths, pinned per Chrome major version
+DRIVER_CACHE = os.path.join(os.path.expanduser("~"), ".wdm", "pinned_chromedriver.json")
+CHROME_BINARIES = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser",
+                   "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"]
+
+
+def chrome_major_version():
+    """
+    Read the installed Chrome major version locally (no network).
+
+    Returns:
+        str: Major version such as '126', or None if Chrome was not found
+    """
+    version = ""
+    if sys.platform == "win32":
+        try:
+            import winreg
+            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon")
+            version = winreg.QueryValueEx(key, "version")[0]
+        except OSError:
+            pass
+    else:
+        for binary in CHROME_BINARIES:
+            path = shutil.which(binary) or (binary if os.path.isfile(binary) else None)
+            if not path:
+                continue
+            try:
+                version = subprocess.run([path, "--version"], capture_output=True,
+                                         text=True, timeout=5).stdout
+                break
+            except (OSError, subprocess.SubprocessError):
+                continue
+    for token in version.split():
+        if token[:1].isdigit():
+            return token.split(".")[0]
+    return None
+
+
+def _load_pins():
+    try:
+        with open(DRIVER_CACHE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_pin(major, path):
+    """Pin `path` for Chrome `major`; None drops the pin."""
+    pins = _load_pins()
+    if path is None:
+        pins.pop(major, None)
+    else:
+        pins[major] = path
+    os.makedirs(os.path.dirname(DRIVER_CACHE), exist_ok=True)
+    with open(DRIVER_CACHE, "w", encoding="utf-8") as f:
+        json.dump(pins, f, indent=2)
+
+
+def resolve_chromedriver(refresh=False):
+    """
+    Find a chromedriver without a network round-trip when possible.
+
+    The path pinned in DRIVER_CACHE for the installed Chrome major version
+    is reused while the file still exists. Otherwise webdriver-manager
+    resolves one and it is pinned, but only when the major version is
+    known. Offline, a chromedriver on PATH is used, and failing that
+    Selenium Manager picks one itself.
+
+    Args:
+        refresh: Drop the pin first (retry after the pinned driver failed)
+
+    Returns:
+        tuple: (chromedriver path or None, description of where it came from)
+    """
+    major = chrome_major_version()
+    if major and refresh:
+        _save_pin(major, None)
+    pinned = _load_pins().get(major) if major else None
+    if pinned and os.path.isfile(pinned) and os.access(pinned, os.X_OK):
+        return pinned, f"pinned for Chrome {major}"
+    try:
+        path = ChromeDriverManager().install()
+        if not major:
+            return path, "webdriver-manager (Chrome version unknown, not pinned)"
+        _save_pin(major, path)
+        return path, f"webdriver-manager, pinned for Chrome {major}"
+    except Exception as e:
+        logger.warning(f"webdriver-manager unavailable ({e}); trying offline fallbacks")
+    on_path = shutil.which("chromedriver")
+    if on_path:
+        return on_path, "chromedriver on PATH"
+    return None, "Selenium Manager"
+
 
 class OrangeHRMAutomation:
     """Complete OrangeHRM automation class"""
@@ -74,12 +171,28 @@ class OrangeHRMAutomation:
             options.add_argument('--start-maximized')
             options.add_argument('--disable-blink-features=AutomationControlled')
 
-            self.driver = webdriver.Chrome(
-                service=Service(ChromeDriverManager().install()),
-                options=options
-            )
+            start = time.perf_counter()
+            driver_path, source = resolve_chromedriver()
+            resolved = time.perf_counter() - start
+            try:
+                self.driver = webdriver.Chrome(
+                    service=Service(driver_path) if driver_path else Service(),
+                    options=options
+                )
+            except WebDriverException as e:
+                if not source.startswith("pinned"):
+                    raise
+                logger.warning(f"Pinned chromedriver failed to start Chrome ({e.msg}); "
+                               f"re-resolving once")
+                driver_path, source = resolve_chromedriver(refresh=True)
+                self.driver = webdriver.Chrome(
+                    service=Service(driver_path) if driver_path else Service(),
+                    options=options
+                )
             self.wait = WebDriverWait(self.driver, 20)
-            logger.info("WebDriver setup completed successfully")
+            logger.info(f"WebDriver setup completed successfully in "
+                        f"{time.perf_counter() - start:.2f}s "
+                        f"(driver: {source}, resolved in {resolved * 1000:.0f} ms)")
             return True
         except Exception as e:
             logger.error(f"Failed to setup WebDriver: {str(e)}")
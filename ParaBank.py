@@ -15,18 +15,35 @@ import os
 import sys
 import csv
 import json
+import time
+import queue
 import logging
 import argparse
+import shutil
+import random
+import asyncio
+import threading
+import subprocess
 import requests
-from datetime import datetime, timedelta
+from collections import Counter
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+try:
+    import httpx
+except ImportError:      # only needed for AsyncParaBankAPIClient
+    httpx = None
 
 # Windows Unicode fix
 if sys.platform == "win32":
@@ -58,6 +75,9 @@ class Config:
     SCREENSHOT_DIR = "screenshots"
     LOG_DIR        = "logs"
 
+    # Resolved chromedriver paths, pinned per Chrome major version
+    DRIVER_CACHE = os.path.join(os.path.expanduser("~"), ".wdm", "pinned_chromedriver.json")
+
 # ============================================================
 # SECTION 2 - LOGGING
 # ============================================================
@@ -82,6 +102,89 @@ logger.addHandler(ch)
 # SECTION 3 - WEBDRIVER
 # ============================================================
 
+CHROME_BINARIES = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser",
+                   "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"]
+
+
+def chrome_major_version():
+    """Installed Chrome's major version, read locally (no network). None if unknown."""
+    version = ""
+    if sys.platform == "win32":
+        try:
+            import winreg
+            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon")
+            version = winreg.QueryValueEx(key, "version")[0]
+        except OSError:
+            pass
+    else:
+        for binary in CHROME_BINARIES:
+            path = shutil.which(binary) or (binary if os.path.isfile(binary) else None)
+            if not path:
+                continue
+            try:
+                version = subprocess.run([path, "--version"], capture_output=True,
+                                         text=True, timeout=5).stdout
+                break
+            except (OSError, subprocess.SubprocessError):
+                continue
+    for token in version.split():
+        if token[:1].isdigit():
+            return token.split(".")[0]
+    return None
+
+
+def _load_pins():
+    try:
+        with open(Config.DRIVER_CACHE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_pin(major, path):
+    """Pin `path` for Chrome `major`; None drops the pin."""
+    pins = _load_pins()
+    if path is None:
+        pins.pop(major, None)
+    else:
+        pins[major] = path
+    os.makedirs(os.path.dirname(Config.DRIVER_CACHE), exist_ok=True)
+    with open(Config.DRIVER_CACHE, "w", encoding="utf-8") as f:
+        json.dump(pins, f, indent=2)
+
+
+def resolve_chromedriver(refresh=False):
+    """
+    Return (chromedriver path or None, how it was found).
+
+    A path pinned for the installed Chrome major version is reused as long
+    as the file is still there, so warm starts make no network calls.
+    Otherwise webdriver-manager resolves one and it gets pinned, but only
+    when the major version is known. `refresh` drops the pin first, for a
+    retry after the pinned driver failed to start a session. Offline, a
+    chromedriver on PATH is used, and failing that None lets Selenium
+    Manager pick a driver itself.
+    """
+    major = chrome_major_version()
+    if major and refresh:
+        _save_pin(major, None)
+    pinned = _load_pins().get(major) if major else None
+    if pinned and os.path.isfile(pinned) and os.access(pinned, os.X_OK):
+        return pinned, f"pinned for Chrome {major}"
+    try:
+        path = ChromeDriverManager().install()
+        if not major:
+            return path, "webdriver-manager (Chrome version unknown, not pinned)"
+        _save_pin(major, path)
+        return path, f"webdriver-manager, pinned for Chrome {major}"
+    except Exception as e:
+        logger.warning(f"webdriver-manager unavailable ({e}); trying offline fallbacks")
+    on_path = shutil.which("chromedriver")
+    if on_path:
+        return on_path, "chromedriver on PATH"
+    return None, "Selenium Manager"
+
+
 def get_driver(headless=None):
     headless = headless if headless is not None else Config.HEADLESS
     options = ChromeOptions()
@@ -95,14 +198,26 @@ def get_driver(headless=None):
     options.add_experimental_option("excludeSwitches", ["enable-logging"])
     options.add_experimental_option("useAutomationExtension", False)
 
-    driver = webdriver.Chrome(
-        service=ChromeService(ChromeDriverManager().install()),
-        options=options
-    )
+    def start(driver_path):
+        service = ChromeService(driver_path) if driver_path else ChromeService()
+        return webdriver.Chrome(service=service, options=options)
+
+    t0 = time.perf_counter()
+    driver_path, source = resolve_chromedriver()
+    resolved = time.perf_counter() - t0
+    try:
+        driver = start(driver_path)
+    except WebDriverException as e:
+        if not source.startswith("pinned"):
+            raise
+        logger.warning(f"Pinned chromedriver failed to start Chrome ({e.msg}); re-resolving once")
+        driver_path, source = resolve_chromedriver(refresh=True)
+        driver = start(driver_path)
     driver.implicitly_wait(Config.IMPLICIT_WAIT)
     driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
     driver.maximize_window()
-    logger.info("Chrome browser started")
+    logger.info(f"Chrome browser started in {time.perf_counter() - t0:.2f}s "
+                f"(driver: {source}, resolved in {resolved * 1000:.0f} ms)")
     return driver
 
 # ============================================================
@@ -110,6 +225,18 @@ def get_driver(headless=None):
 # ============================================================
 
 class BasePage:
+    # Whole table -> {"headers": [...], "rows": [[...], ...]} in one round trip
+    READ_TABLE_JS = """
+        const table = document.querySelector(arguments[0]);
+        if (!table) return null;
+        const text = el => (el.innerText || el.textContent || "").trim();
+        return {
+            headers: Array.from(table.querySelectorAll("thead th"), text),
+            rows: Array.from(table.querySelectorAll("tbody tr"),
+                             tr => Array.from(tr.cells, text)),
+        };
+    """
+
     def __init__(self, driver):
         self.driver = driver
         self.wait = WebDriverWait(driver, Config.EXPLICIT_WAIT)
@@ -146,6 +273,24 @@ class BasePage:
         except TimeoutException:
             return False
 
+    def read_table(self, locator):
+        """
+        Read the table at a (By.CSS_SELECTOR, css) `locator` as (headers,
+        rows) with a single execute_script call instead of one WebDriver
+        request per cell. Waits for the first body row first, since
+        ParaBank fills some tables in after the page loads.
+        """
+        _, css = locator
+        self.find((By.CSS_SELECTOR, f"{css} tbody tr"))
+        table = self.driver.execute_script(self.READ_TABLE_JS, css) or {}
+        return table.get("headers", []), table.get("rows", [])
+
+    def read_table_dicts(self, locator):
+        """read_table() rows as dicts keyed by the header cells."""
+        headers, rows = self.read_table(locator)
+        return [{headers[i]: cols[i] for i in range(min(len(headers), len(cols)))}
+                for cols in rows]
+
     def wait_for_url(self, fragment, timeout=15):
         WebDriverWait(self.driver, timeout).until(EC.url_contains(fragment))
 
@@ -193,7 +338,7 @@ class LoginPage(BasePage):
 # ============================================================
 
 class AccountsPage(BasePage):
-    ACCOUNTS_TABLE   = (By.ID, "accountTable")
+    ACCOUNTS_TABLE   = (By.CSS_SELECTOR, "#accountTable")
     ACCOUNT_ROWS     = (By.CSS_SELECTOR, "#accountTable tbody tr")
     TOTAL_VALUE      = (By.XPATH, "//table[@id='accountTable']//tfoot//td[2]")
     TRANSFER_LINK    = (By.LINK_TEXT, "Transfer Funds")
@@ -212,14 +357,10 @@ class AccountsPage(BasePage):
     def get_accounts(self):
         accounts = []
         try:
-            rows = self.find_all(self.ACCOUNT_ROWS)
-            for row in rows:
-                cols = row.find_elements(By.TAG_NAME, "td")
+            _, rows = self.read_table(self.ACCOUNTS_TABLE)
+            for cols in rows:
                 if len(cols) >= 2:
-                    accounts.append({
-                        "Account": cols[0].text.strip(),
-                        "Balance": cols[1].text.strip() if len(cols) > 1 else ""
-                    })
+                    accounts.append({"Account": cols[0], "Balance": cols[1]})
         except Exception as e:
             logger.warning(f"Could not read accounts: {e}")
         return accounts
@@ -298,9 +439,7 @@ class AccountActivityPage(BasePage):
     MONTH_SELECT     = (By.ID, "month")
     TYPE_SELECT      = (By.ID, "transactionType")
     GO_BTN           = (By.XPATH, "//button[@type='submit' and text()='Go']")
-    TRANS_TABLE      = (By.ID, "transactionTable")
-    TRANS_ROWS       = (By.CSS_SELECTOR, "#transactionTable tbody tr")
-    TRANS_HEADERS    = (By.CSS_SELECTOR, "#transactionTable thead th")
+    TRANS_TABLE      = (By.CSS_SELECTOR, "#transactionTable")
     NO_TRANS_MSG     = (By.XPATH, "//*[contains(text(),'No transactions found')]")
 
     def open_activity(self, account_id=None):
@@ -324,14 +463,7 @@ class AccountActivityPage(BasePage):
             if self.is_displayed(self.NO_TRANS_MSG, timeout=3):
                 logger.info("No transactions found")
                 return []
-            headers = [h.text.strip() for h in self.find_all(self.TRANS_HEADERS)]
-            rows = self.find_all(self.TRANS_ROWS)
-            result = []
-            for row in rows:
-                cols = row.find_elements(By.TAG_NAME, "td")
-                data = {headers[i]: cols[i].text.strip()
-                        for i in range(min(len(headers), len(cols)))}
-                result.append(data)
+            result = self.read_table_dicts(self.TRANS_TABLE)
             logger.info(f"Found {len(result)} transactions")
             return result
         except Exception as e:
@@ -605,7 +737,7 @@ class ParaBankTests:
 # SECTION 12 - MAIN RUNNER
 # ============================================================
 
-def run_all(headless=False):
+def log_start():
     logger.info("=" * 60)
     logger.info("   PARABANK AUTOMATION STARTING")
     logger.info("   Site: https://parabank.parasoft.com")
@@ -619,6 +751,10 @@ def run_all(headless=False):
         logger.warning(" 3. Update USERNAME and PASSWORD in Config section (top of file)")
         logger.warning("=" * 60)
 
+
+def run_all(headless=False):
+    log_start()
+
     driver = get_driver(headless=headless)
     reporter = ReportGenerator()
     tester = ParaBankTests(driver)
@@ -664,23 +800,7 @@ def run_all(headless=False):
 
         # STEP 5: API Tests
         logger.info("\n--- STEP 5: API TESTS ---")
-        api = ParaBankAPIClient()
-        api_data = api.login(Config.USERNAME, Config.PASSWORD)
-        if api_data:
-            api_accounts = api.get_accounts()
-            if api_accounts:
-                first_acc_id = api_accounts[0].get("id")
-                api_balance = api.get_balance(first_acc_id)
-                api_txns = api.get_transactions(first_acc_id)
-                if not all_transactions and api_txns:
-                    # Use API transactions if UI had none
-                    all_transactions = [
-                        {"ID": str(t.get("id","")),
-                         "Date": str(t.get("date","")),
-                         "Description": str(t.get("description","")),
-                         "Amount": str(t.get("amount",""))}
-                        for t in api_txns
-                    ]
+        all_transactions = run_api_checks(all_transactions)
 
         # STEP 6: Logout
         logger.info("\n--- STEP 6: LOGOUT ---")
@@ -699,6 +819,32 @@ def run_all(headless=False):
         logger.info("Browser closed")
 
     # STEP 7: Generate Reports
+    save_reports(reporter, tester, all_transactions, balance, account_id)
+
+
+def run_api_checks(all_transactions):
+    """Exercise the REST API; its transactions fill in when the UI had none."""
+    api = ParaBankAPIClient()
+    api_data = api.login(Config.USERNAME, Config.PASSWORD)
+    if api_data:
+        api_accounts = api.get_accounts()
+        if api_accounts:
+            first_acc_id = api_accounts[0].get("id")
+            api_balance = api.get_balance(first_acc_id)
+            api_txns = api.get_transactions(first_acc_id)
+            if not all_transactions and api_txns:
+                # Use API transactions if UI had none
+                all_transactions = [
+                    {"ID": str(t.get("id","")),
+                     "Date": str(t.get("date","")),
+                     "Description": str(t.get("description","")),
+                     "Amount": str(t.get("amount",""))}
+                    for t in api_txns
+                ]
+    return all_transactions
+
+
+def save_reports(reporter, tester, all_transactions, balance, account_id):
     logger.info("\n--- STEP 7: GENERATING REPORTS ---")
     if all_transactions:
         reporter.save_csv(all_transactions, "transactions.csv")
@@ -733,9 +879,670 @@ def run_all(headless=False):
     logger.info("=" * 60)
 
 
+# ============================================================
+# SECTION 13 - PARALLEL RUNNER (WebDriver pool)
+# ============================================================
+
+class DriverPool:
+    """
+    Up to `size` Chrome instances shared by worker threads. A driver is
+    started on first demand, handed to one job at a time and has its
+    cookies wiped between jobs so every job logs in with a fresh session.
+    Only the slot is reserved under the lock, so cold starts run in parallel.
+    """
+    def __init__(self, size, headless=True):
+        self.size = size
+        self.headless = headless
+        self._idle = queue.Queue()
+        self._all = []
+        self._started = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def driver(self):
+        driver = None
+        while driver is None:
+            try:
+                driver = self._idle.get_nowait()
+                break
+            except queue.Empty:
+                pass
+            with self._lock:
+                start = self._started < self.size
+                if start:
+                    self._started += 1
+            if start:
+                try:
+                    driver = get_driver(headless=self.headless)
+                except Exception:
+                    with self._lock:
+                        self._started -= 1      # free the slot for a later retry
+                    raise
+                with self._lock:
+                    self._all.append(driver)
+            else:
+                try:
+                    driver = self._idle.get(timeout=1)
+                except queue.Empty:
+                    pass                        # a failed start may have freed a slot
+        try:
+            yield driver
+        finally:
+            try:
+                driver.delete_all_cookies()
+            except Exception:
+                pass
+            self._idle.put(driver)
+
+    def close(self):
+        for driver in self._all:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        logger.info(f"Closed {len(self._all)} browser(s)")
+
+
+def _session_login(tester):
+    """Log a worker's browser in without recording a test case."""
+    login = LoginPage(tester.driver)
+    login.login(Config.USERNAME, Config.PASSWORD)
+    if not login.is_login_successful():
+        raise RuntimeError("worker login failed")
+
+
+def _safe_logout(driver):
+    try:
+        AccountsPage(driver).logout()
+    except Exception:
+        pass
+
+
+# Independent groups of test cases. Each job gets its own driver and
+# session, so only the cases that share page state stay together.
+def job_login(tester):
+    if tester.test_valid_login():
+        tester.test_invalid_login()
+    _safe_logout(tester.driver)
+    return {}
+
+
+def job_accounts(tester):
+    _session_login(tester)
+    tester.test_account_balance()
+    accounts = tester.test_view_accounts()
+    account_id = AccountsPage(tester.driver).get_first_account_id()
+    balance = 0.0
+    if accounts and accounts[0].get("Balance"):
+        try:
+            balance = float(accounts[0]["Balance"].replace("$","").replace(",","").strip())
+        except Exception:
+            balance = 0.0
+    _safe_logout(tester.driver)
+    return {"account_id": account_id, "balance": balance}
+
+
+def job_transfer(tester):
+    _session_login(tester)
+    accounts = AccountsPage(tester.driver).get_accounts()
+    tester.test_fund_transfer(accounts)
+    tester.test_invalid_transfer()
+    _safe_logout(tester.driver)
+    return {}
+
+
+def job_history(tester):
+    _session_login(tester)
+    account_id = AccountsPage(tester.driver).get_first_account_id()
+    txns = tester.test_transaction_history(account_id)
+    tester.test_filter_transactions(account_id)
+    _safe_logout(tester.driver)
+    return {"transactions": txns}
+
+
+PARALLEL_JOBS = [
+    ("TC001-TC002", job_login),
+    ("TC003-TC004", job_accounts),
+    ("TC005-TC006", job_transfer),
+    ("TC007-TC008", job_history),
+]
+
+
+def run_parallel(headless=True, workers=2):
+    """
+    Run PARALLEL_JOBS across a pool of `workers` browsers, then merge every
+    job's results into one ParaBankTests so the CSV/JSON reports keep the
+    same shape (and TC order) as run_all().
+    """
+    log_start()
+    logger.info(f"Parallel run: {len(PARALLEL_JOBS)} jobs on {workers} browser(s)")
+    pool = DriverPool(workers, headless=headless)
+    reporter = ReportGenerator()
+    tester = ParaBankTests(driver=None)
+    found = {}
+    started = time.perf_counter()
+
+    def work(name, job):
+        # A browser that fails to start fails this job group only; the run
+        # still merges the other jobs and writes its reports.
+        job_tester = ParaBankTests(driver=None)
+        t0 = time.perf_counter()
+        try:
+            with pool.driver() as driver:
+                job_tester.driver = driver
+                out = job(job_tester)
+        except Exception as e:
+            logger.error(f"{name} aborted: {e}")
+            job_tester.record(name, "Job aborted", False, str(e)[:80])
+            out = {}
+        logger.info(f"{name} finished in {time.perf_counter() - t0:.1f}s")
+        return job_tester.results, out
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(work, name, job) for name, job in PARALLEL_JOBS]
+            for future in futures:
+                results, out = future.result()
+                tester.results.extend(results)
+                found.update(out)
+    finally:
+        pool.close()
+
+    tester.results.sort(key=lambda r: r["ID"])
+    logger.info(f"All jobs done in {time.perf_counter() - started:.1f}s")
+
+    logger.info("\n--- STEP 5: API TESTS ---")
+    all_transactions = run_api_checks(found.get("transactions") or [])
+    save_reports(reporter, tester, all_transactions,
+                 found.get("balance", 0.0), found.get("account_id"))
+
+
+# ============================================================
+# SECTION 14 - DATA EXTRACTION STRATEGIES (API first, UI fallback)
+# ============================================================
+
+def _money(text):
+    """'$1,234.50' / '-$10.00' / 1234.5 -> float (0.0 when blank)."""
+    if isinstance(text, (int, float)):
+        return float(text)
+    text = str(text or "").replace("$", "").replace(",", "").strip()
+    return float(text) if text else 0.0
+
+
+def _api_date(value):
+    """
+    ParaBank's API sends epoch milliseconds; the UI shows MM-DD-YYYY.
+    Converted in UTC so the day doesn't shift with the runner's timezone.
+    """
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000, tz=timezone.utc).strftime("%m-%d-%Y")
+    return str(value or "")
+
+
+class DataExtractor:
+    """
+    Accounts, balances and transactions from ParaBank in one normalised
+    shape, whichever source they come from:
+
+        account:     {"Account": "13344", "Balance": 515.5}
+        transaction: {"Date": "01-15-2024", "Description": "...", "Amount": -10.0}
+
+    The REST API is tried first. The UI is used only when `fallback=True`
+    and the API call failed or came back empty, or when source="ui" is
+    asked for explicitly. Every fetch is timed per source, with account
+    and transaction fetches kept apart in `timings` so costs can be
+    compared per 1,000 transactions.
+    """
+    def __init__(self, api=None, driver=None, fallback=False):
+        self.api = api
+        self.driver = driver
+        self.fallback = fallback
+        self.timings = {kind: {"api": {"rows": 0, "seconds": 0.0},
+                               "ui": {"rows": 0, "seconds": 0.0}}
+                        for kind in ("accounts", "transactions")}
+
+    def _timed(self, kind, source, fetch):
+        t0 = time.perf_counter()
+        rows = fetch()
+        self.timings[kind][source]["seconds"] += time.perf_counter() - t0
+        self.timings[kind][source]["rows"] += len(rows)
+        return rows
+
+    def _pick(self, kind, source, from_api, from_ui):
+        if source != "ui" and self.api is not None:
+            rows = self._timed(kind, "api", from_api)
+            if rows or not self.fallback:
+                return rows, "api"
+            logger.info("API returned nothing - falling back to the UI")
+        if self.driver is None:
+            return [], "none"
+        return self._timed(kind, "ui", from_ui), "ui"
+
+    # -- API side --------------------------------------------------------
+    def _api_accounts(self):
+        return [{"Account": str(a.get("id", "")), "Balance": _money(a.get("balance"))}
+                for a in self.api.get_accounts()]
+
+    def _api_transactions(self, account_id):
+        return [{"Date": _api_date(t.get("date")),
+                 "Description": str(t.get("description", "")),
+                 "Amount": -_money(t.get("amount")) if t.get("type") == "Debit"
+                           else _money(t.get("amount"))}
+                for t in self.api.get_transactions(account_id)]
+
+    # -- UI side ---------------------------------------------------------
+    def _ui_accounts(self):
+        page = AccountsPage(self.driver)
+        page.open("overview.htm")
+        return [{"Account": a["Account"], "Balance": _money(a["Balance"])}
+                for a in page.get_accounts() if a["Account"].isdigit()]
+
+    def _ui_transactions(self, account_id):
+        activity = AccountActivityPage(self.driver)
+        activity.open_activity(account_id)
+        rows = []
+        for tx in activity.get_transactions():
+            debit = _money(tx.get("Debit (-)"))
+            credit = _money(tx.get("Credit (+)"))
+            rows.append({"Date": tx.get("Date", ""),
+                         "Description": tx.get("Transaction", ""),
+                         "Amount": credit - debit})
+        return rows
+
+    # -- Public ----------------------------------------------------------
+    def accounts(self, source=None):
+        rows, used = self._pick("accounts", source, self._api_accounts, self._ui_accounts)
+        logger.info(f"Accounts via {used}: {len(rows)}")
+        return rows
+
+    def balances(self, source=None):
+        return {a["Account"]: a["Balance"] for a in self.accounts(source)}
+
+    def transactions(self, account_id, source=None):
+        rows, used = self._pick("transactions", source,
+                                lambda: self._api_transactions(account_id),
+                                lambda: self._ui_transactions(account_id))
+        logger.info(f"Transactions for {account_id} via {used}: {len(rows)}")
+        return rows
+
+    def both_balances(self):
+        """({account: balance} from the API, the same from the UI), fetched once."""
+        api_bal = {a["Account"]: a["Balance"]
+                   for a in self._timed("accounts", "api", self._api_accounts)}
+        ui_bal = {a["Account"]: a["Balance"]
+                  for a in self._timed("accounts", "ui", self._ui_accounts)}
+        return api_bal, ui_bal
+
+    def cross_check(self, account_id, balances=None):
+        """
+        Diff one account's balance and transactions between API and UI.
+        Pass `balances` from both_balances() when checking several accounts
+        so the account lists are fetched once per run, not once per account.
+        """
+        api_bal, ui_bal = balances or self.both_balances()
+        key = lambda t: (t["Date"], t["Description"], round(t["Amount"], 2))
+        api_tx = sorted(map(key, self._timed("transactions", "api",
+                                             lambda: self._api_transactions(account_id))))
+        ui_tx = sorted(map(key, self._timed("transactions", "ui",
+                                            lambda: self._ui_transactions(account_id))))
+        balance_diffs = {}
+        if round(api_bal.get(account_id, -1), 2) != round(ui_bal.get(account_id, -1), 2):
+            balance_diffs[account_id] = {"api": api_bal.get(account_id),
+                                         "ui": ui_bal.get(account_id)}
+        # Multisets, so 3 identical API rows against 1 UI row still differ
+        only_api = sorted((Counter(api_tx) - Counter(ui_tx)).elements())
+        only_ui = sorted((Counter(ui_tx) - Counter(api_tx)).elements())
+        result = {
+            "account": account_id,
+            "consistent": not (balance_diffs or only_api or only_ui),
+            "balance_mismatches": balance_diffs,
+            "transactions_api": len(api_tx),
+            "transactions_ui": len(ui_tx),
+            "only_in_api": only_api,
+            "only_in_ui": only_ui,
+        }
+        tag = "[PASS]" if result["consistent"] else "[FAIL]"
+        logger.info(f"{tag} API/UI cross-check for {account_id}: "
+                    f"{len(api_tx)} vs {len(ui_tx)} transactions, "
+                    f"{len(balance_diffs)} balance mismatch(es)")
+        return result
+
+    def cost_per_1000(self):
+        """Seconds per 1,000 transactions fetched, per source (None if unused)."""
+        return {source: (t["seconds"] * 1000 / t["rows"] if t["rows"] else None)
+                for source, t in self.timings["transactions"].items()}
+
+
+def run_extraction(headless=False, source="api", fallback=False, cross_check=False):
+    """Pull accounts and transactions through DataExtractor and report costs."""
+    log_start()
+    api = ParaBankAPIClient()
+    if not api.login(Config.USERNAME, Config.PASSWORD):
+        api = None
+    driver = None
+    if source == "ui" or fallback or cross_check:
+        driver = get_driver(headless=headless)
+        LoginPage(driver).login(Config.USERNAME, Config.PASSWORD).is_login_successful()
+    extractor = DataExtractor(api, driver, fallback=fallback)
+    report = {"run_time": datetime.now().isoformat(), "source": source}
+    try:
+        accounts = extractor.accounts(source)
+        report["accounts"] = accounts
+        report["transactions"] = {a["Account"]: extractor.transactions(a["Account"], source)
+                                  for a in accounts}
+        if cross_check and api is None:
+            logger.warning("API login failed - skipping the API/UI cross-check")
+            report["cross_check"] = "unavailable"
+        elif cross_check and accounts:
+            balances = extractor.both_balances()
+            report["cross_check"] = [extractor.cross_check(a["Account"], balances)
+                                     for a in accounts]
+    finally:
+        if driver:
+            driver.quit()
+    report["seconds_per_1000_transactions"] = extractor.cost_per_1000()
+    report["timings"] = extractor.timings
+    for name, cost in report["seconds_per_1000_transactions"].items():
+        if cost is not None:
+            logger.info(f"  {name.upper():<4} {cost:8.3f} s per 1,000 transactions "
+                        f"({extractor.timings['transactions'][name]['rows']} transactions)")
+    ReportGenerator().save_json(report, "extraction.json")
+    return report
+
+
+# ============================================================
+# SECTION 15 - ASYNC REST CLIENT + LOCAL STAND-IN SERVER
+# ============================================================
+
+class AsyncParaBankAPIClient:
+    """
+    asyncio counterpart of ParaBankAPIClient (needs httpx).
+
+    One pooled httpx.AsyncClient is shared by every request. At most
+    `max_connections` sockets are open, and a per-host semaphore caps
+    in-flight requests at `per_host`. GETs that hit a transport error or
+    a 429/5xx response are retried up to `retries` times with jittered
+    exponential backoff. Other methods (the transfer POST) are retried
+    only when the connection was never made, so a transfer can't be sent
+    twice. Failures are logged and return the same empty values as the
+    sync client.
+
+        async with AsyncParaBankAPIClient() as api:
+            await api.login(user, pwd)
+            balances = await api.get_all_balances(ids)
+    """
+    API_URL = ParaBankAPIClient.API_URL
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    IDEMPOTENT = {"GET", "HEAD", "OPTIONS"}
+
+    def __init__(self, api_url=None, max_connections=20, per_host=10,
+                 retries=3, backoff=0.2, timeout=15):
+        if httpx is None:
+            raise RuntimeError("AsyncParaBankAPIClient needs httpx (pip install httpx)")
+        self.api_url = (api_url or self.API_URL).rstrip("/")
+        self.max_connections = max_connections
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.client = None
+        self._host_limits = {}
+        self.customer_id = None
+        self.accounts = []
+
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(
+            headers={"Accept": "application/json"},
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_connections),
+            timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.client.aclose()
+
+    def _limit(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host)
+        return self._host_limits[host]
+
+    async def _request(self, method, path, params=None):
+        url = f"{self.api_url}/{path.lstrip('/')}"
+        idempotent = method in self.IDEMPOTENT
+        for attempt in range(self.retries + 1):
+            try:
+                async with self._limit(url):
+                    resp = await self.client.request(method, url, params=params)
+                if resp.status_code not in self.RETRY_STATUSES or not idempotent:
+                    resp.raise_for_status()
+                    return resp.json() if resp.content else {}
+                error = f"HTTP {resp.status_code}"
+            except httpx.TransportError as e:
+                # Past the connect phase the server may have acted on it
+                never_sent = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+                if not idempotent and not isinstance(e, never_sent):
+                    raise
+                error = repr(e)
+            if attempt == self.retries:
+                raise RuntimeError(f"{method} {path} failed after {attempt + 1} tries: {error}")
+            # Full jitter: anywhere up to the exponential backoff step
+            await asyncio.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+
+    async def login(self, username, password):
+        try:
+            data = await self._request("GET", f"login/{username}/{password}")
+            self.customer_id = data.get("id")
+            logger.info(f"Async API Login OK - Customer ID: {self.customer_id}")
+            return data
+        except Exception as e:
+            logger.error(f"Async API Login failed: {e}")
+            return {}
+
+    async def get_accounts(self):
+        if not self.customer_id:
+            return []
+        try:
+            self.accounts = await self._request("GET", f"customers/{self.customer_id}/accounts")
+            return self.accounts
+        except Exception as e:
+            logger.error(f"Async API get accounts failed: {e}")
+            return []
+
+    async def get_balance(self, account_id):
+        try:
+            data = await self._request("GET", f"accounts/{account_id}")
+            return data.get("balance", 0)
+        except Exception as e:
+            logger.error(f"Async API get balance failed for {account_id}: {e}")
+            return 0
+
+    async def get_transactions(self, account_id):
+        try:
+            return await self._request("GET", f"accounts/{account_id}/transactions")
+        except Exception as e:
+            logger.error(f"Async API get transactions failed for {account_id}: {e}")
+            return []
+
+    async def transfer_funds(self, from_id, to_id, amount):
+        params = {"fromAccountId": from_id, "toAccountId": to_id, "amount": amount}
+        try:
+            await self._request("POST", "transfer", params=params)
+            logger.info(f"Async API Transfer ${amount} from {from_id} to {to_id} - OK")
+            return True
+        except Exception as e:
+            logger.error(f"Async API transfer failed: {e}")
+            return False
+
+    # -- Fan-out helpers ---------------------------------------------------
+    async def get_all_balances(self, account_ids):
+        """{account_id: balance} for every id, fetched concurrently."""
+        balances = await asyncio.gather(*(self.get_balance(a) for a in account_ids))
+        return dict(zip(account_ids, balances))
+
+    async def get_all_transactions(self, account_ids):
+        """{account_id: [transactions]} for every id, fetched concurrently."""
+        txns = await asyncio.gather(*(self.get_transactions(a) for a in account_ids))
+        return dict(zip(account_ids, txns))
+
+
+class StandInParaBank:
+    """
+    Local fake of the ParaBank REST endpoints the API clients use, for
+    measuring client throughput without touching the real demo bank.
+    Each request sleeps `latency` seconds, and roughly `fail_rate` of
+    them answer 503 so the retry path is exercised.
+
+        with StandInParaBank(accounts=100, latency=0.05) as url:
+            api = ParaBankAPIClient(); api.API_URL = url
+    """
+    def __init__(self, accounts=50, transactions=20, latency=0.05, fail_rate=0.0, seed=0):
+        rng = random.Random(seed)
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.rng = rng
+        self.customer_id = 12212
+        self.accounts = {13000 + i: {"id": 13000 + i, "customerId": self.customer_id,
+                                     "type": rng.choice(["CHECKING", "SAVINGS"]),
+                                     "balance": round(rng.uniform(0, 5000), 2)}
+                         for i in range(accounts)}
+        day_ms = 86_400_000
+        self.transactions = {
+            acc: [{"id": acc * 100 + n, "accountId": acc,
+                   "type": rng.choice(["Credit", "Debit"]),
+                   "date": 1704067200000 + rng.randrange(365) * day_ms,
+                   "amount": round(rng.uniform(1, 500), 2),
+                   "description": "Funds Transfer Sent"}
+                  for n in range(transactions)]
+            for acc in self.accounts}
+        self.requests = 0
+        self._server = None
+
+    def _handler(self):
+        bank = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"       # keep-alive, so pooling matters
+            disable_nagle_algorithm = True      # headers and body go out as two writes
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body=None):
+                data = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _route(self):
+                bank.requests += 1
+                time.sleep(bank.latency)
+                if bank.fail_rate and bank.rng.random() < bank.fail_rate:
+                    return self._send(503, {"error": "try again"})
+                parts = urlsplit(self.path).path.split("/services/bank/")[-1].split("/")
+                if parts[0] == "login" and len(parts) == 3:
+                    return self._send(200, {"id": bank.customer_id, "firstName": "Stand",
+                                            "lastName": "In"})
+                if parts[0] == "customers" and parts[-1] == "accounts":
+                    return self._send(200, list(bank.accounts.values()))
+                if parts[0] == "accounts" and parts[1].isdigit():
+                    acc = int(parts[1])
+                    if acc not in bank.accounts:
+                        return self._send(404, {"error": "no such account"})
+                    if len(parts) == 3 and parts[2] == "transactions":
+                        return self._send(200, bank.transactions[acc])
+                    return self._send(200, bank.accounts[acc])
+                if parts[0] == "transfer":
+                    q = parse_qs(urlsplit(self.path).query)
+                    amount = float(q["amount"][0])
+                    bank.accounts[int(q["fromAccountId"][0])]["balance"] -= amount
+                    bank.accounts[int(q["toAccountId"][0])]["balance"] += amount
+                    return self._send(200, {"message": "Successfully transferred"})
+                return self._send(404, {"error": "unknown endpoint"})
+
+            do_GET = do_POST = _route
+
+        return Handler
+
+    def __enter__(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/parabank/services/bank"
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def benchmark_api(accounts=50, latency=0.05, concurrency=10, fail_rate=0.0):
+    """Sync vs async balance + transaction fetches against StandInParaBank."""
+    logger.info(f"API benchmark: {accounts} accounts, {latency * 1000:.0f} ms latency, "
+                f"concurrency {concurrency}, fail rate {fail_rate:.0%}")
+    with StandInParaBank(accounts=accounts, latency=latency, fail_rate=fail_rate) as url:
+        api = ParaBankAPIClient()
+        api.API_URL = url
+        t0 = time.perf_counter()
+        api.login("standin", "standin")
+        ids = [a["id"] for a in api.get_accounts()]
+        sync_bal = {a: api.get_balance(a) for a in ids}
+        for a in ids:
+            api.get_transactions(a)
+        sync_s = time.perf_counter() - t0
+
+        async def fetch_all():
+            async with AsyncParaBankAPIClient(url, max_connections=concurrency,
+                                              per_host=concurrency) as client:
+                await client.login("standin", "standin")
+                ids = [a["id"] for a in await client.get_accounts()]
+                balances = await client.get_all_balances(ids)
+                await client.get_all_transactions(ids)
+                return balances
+
+        t0 = time.perf_counter()
+        async_bal = asyncio.run(fetch_all())
+        async_s = time.perf_counter() - t0
+
+    calls = 2 + 2 * len(ids)
+    logger.info(f"  sync  (requests) : {sync_s:7.2f}s  {calls / sync_s:8.1f} req/s")
+    logger.info(f"  async (httpx)    : {async_s:7.2f}s  {calls / async_s:8.1f} req/s  "
+                f"({sync_s / async_s:.1f}x)")
+    logger.info(f"  balances match   : {sync_bal == async_bal}")
+    return {"sync_seconds": sync_s, "async_seconds": async_s, "requests": calls}
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="ParaBank Selenium Automation")
     parser.add_argument("--headless", action="store_true",
                         help="Run without browser window")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Headless browsers to run test cases on in parallel (default: 1)")
+    parser.add_argument("--extract", choices=["api", "ui"], default=None,
+                        help="Only pull accounts/transactions from this source (no tests)")
+    parser.add_argument("--ui-fallback", action="store_true",
+                        help="With --extract api, fall back to the UI when the API fails")
+    parser.add_argument("--cross-check", action="store_true",
+                        help="With --extract, compare API and UI data and time both")
+    parser.add_argument("--bench-api", type=int, default=0, metavar="N",
+                        help="Benchmark sync vs async API clients on N stand-in accounts")
+    parser.add_argument("--concurrency", type=int, default=10,
+                        help="With --bench-api, async connection/per-host limit (default: 10)")
+    parser.add_argument("--latency", type=float, default=0.05, metavar="SECONDS",
+                        help="With --bench-api, stand-in delay per request (default: 0.05)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, metavar="P",
+                        help="With --bench-api, share of stand-in requests that answer 503 "
+                             "(default: 0)")
     args = parser.parse_args()
-    run_all(headless=args.headless)
\ No newline at end of file
+    if args.bench_api:
+        benchmark_api(accounts=args.bench_api, latency=args.latency,
+                      concurrency=args.concurrency, fail_rate=args.fail_rate)
+    elif args.extract:
+        run_extraction(headless=args.headless, source=args.extract,
+                       fallback=args.ui_fallback, cross_check=args.cross_check)
+    elif args.workers > 1:
+        run_parallel(headless=True, workers=args.workers)
+    else:
+        run_all(headless=args.headless)
\ No newline at end of file